@@ -0,0 +1,120 @@
+import os
+import pygame
+
+BASE_DIR = os.path.dirname(__file__)
+
+
+def asset_path(*parts):
+    """Monta o caminho absoluto de um arquivo dentro de assets/"""
+    return os.path.join(BASE_DIR, "assets", *parts)
+
+
+def cut_frames(sheet, grid, size=None, flip=False):
+    """Recorta a spritesheet em grid (colunas, linhas), escala e espelha cada frame"""
+    cols, rows = grid
+
+    if cols == 1 and rows == 1:
+        # Imagem única: só escala (sem recorte)
+        frame = pygame.transform.scale(sheet, size) if size else sheet.copy()
+        if flip:
+            frame = pygame.transform.flip(frame, True, False)
+        return (frame,)
+
+    sheet_width, sheet_height = sheet.get_size()
+    frame_width = sheet_width // cols
+    frame_height = sheet_height // rows
+
+    frames = []
+    for row in range(rows):
+        for col in range(cols):
+            frame = pygame.Surface((frame_width, frame_height), pygame.SRCALPHA)
+            frame.blit(
+                sheet,
+                (0, 0),
+                pygame.Rect(col * frame_width, row * frame_height, frame_width, frame_height),
+            )
+            if size:
+                frame = pygame.transform.scale(frame, size)
+            if flip:
+                frame = pygame.transform.flip(frame, True, False)
+            frames.append(frame)
+    return tuple(frames)
+
+
+class FrameCache:
+    """
+    Cache de frames compartilhado pelo processo inteiro.
+
+    Cada entrada é indexada por (caminho da spritesheet, grid (colunas, linhas),
+    tamanho final, flip) e guarda a tupla de frames já recortados e escalados,
+    em ordem de leitura (linha a linha). A spritesheet decodificada também fica
+    guardada, então o disco só é lido uma vez por arquivo.
+
+    Como as superfícies são compartilhadas, quem usa o cache não deve desenhar
+    em cima delas.
+    """
+
+    def __init__(self):
+        self._frames = {}
+        self._sheets = {}
+
+        # Estatísticas (para confirmar que o spawn não faz I/O)
+        self.hits = 0
+        self.misses = 0
+        self.disk_loads = 0
+
+    def get_frames(self, path, grid=(1, 1), size=None, flip=False):
+        """Retorna a tupla de frames da spritesheet, carregando só na primeira vez"""
+        key = (path, tuple(grid), tuple(size) if size else None, flip)
+        frames = self._frames.get(key)
+        if frames is not None:
+            self.hits += 1
+            return frames
+
+        self.misses += 1
+        frames = cut_frames(self._get_sheet(path), grid, size, flip)
+        self._frames[key] = frames
+        return frames
+
+    def add_frames(self, path, grid, size, flip, frames):
+        """Registra frames já prontos (ex.: vindos do pacote de assets)"""
+        self._frames[(path, tuple(grid), tuple(size) if size else None, flip)] = tuple(frames)
+
+    def add_sheet(self, path, sheet):
+        """Registra uma spritesheet já carregada (ex.: pelo AssetLoader)"""
+        self._sheets[path] = sheet
+
+    def has_sheet(self, path):
+        return path in self._sheets
+
+    def get_image(self, path, size=None):
+        """Atalho para imagens de um frame só"""
+        return self.get_frames(path, (1, 1), size)[0]
+
+    def _get_sheet(self, path):
+        sheet = self._sheets.get(path)
+        if sheet is None:
+            sheet = pygame.image.load(path).convert_alpha()
+            self.disk_loads += 1
+            self._sheets[path] = sheet
+        return sheet
+
+    def stats(self):
+        """Retorna um resumo do uso do cache"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'disk_loads': self.disk_loads,
+            'entries': len(self._frames),
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+    def clear(self):
+        """Esvazia o cache (ex.: depois de recriar o display)"""
+        self._frames.clear()
+        self._sheets.clear()
+
+
+# Instância única usada por sprites.py
+frame_cache = FrameCache()
@@ -0,0 +1,299 @@
+"""
+Pacote de assets pré-processados (frames já recortados/escalados e sons em PCM).
+
+Um arquivo binário só, lido com mmap:
+
+    MAGIC (4 bytes) | versão (u32) | tamanho do índice (u32) | índice JSON | dados
+
+O índice guarda, para cada arquivo de origem, mtime/tamanho/SHA-256; para
+cada conjunto de frames (origem, grid, tamanho final, flip) os offsets dos
+pixels RGBA; para cada som, o offset do PCM e o formato do mixer em que foi
+gerado. Uma entrada só é usada se a origem não mudou (mtime e tamanho iguais,
+ou o mesmo hash) e, para sons, se o mixer estiver no mesmo formato.
+
+    python asset_pack.py            # gera/atualiza (só refaz o que mudou)
+    python asset_pack.py --force    # refaz tudo
+"""
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+
+import pygame
+from settings import *
+from asset_cache import BASE_DIR, asset_path, cut_frames
+from sound_manager import SOUNDS
+
+MAGIC = b"RAPK"
+VERSION = 1
+HEADER = struct.Struct("<4sII")
+
+# Frames que o jogo pede ao frame_cache (mesmos argumentos usados em sprites.py)
+FRAME_SPECS = (
+    (asset_path("Protagonista.png"), (3, 3), (TILE_SIZE * 3, TILE_SIZE * 3), False),
+    (asset_path("Protagonista.png"), (3, 3), (TILE_SIZE * 3, TILE_SIZE * 3), True),
+    (asset_path("Inimigo.png"), (2, 2), (ENEMY_SIZE, ENEMY_SIZE), False),
+    (asset_path("Projetil.png"), (1, 1), (PROJECTILE_SIZE, PROJECTILE_SIZE), False),
+    (asset_path("tux.webp"), (1, 1), (TILE_SIZE, TILE_SIZE), False),
+)
+
+# Sons do SoundManager (caminhos relativos à pasta de execução, como lá)
+SOUND_FILES = tuple(path for path, _, _ in SOUNDS.values())
+
+
+def pack_path():
+    return os.path.join(BASE_DIR, ASSET_PACK)
+
+
+def source_name(path):
+    """Nome da origem no índice: caminho relativo à pasta do jogo"""
+    return os.path.relpath(os.path.abspath(path), os.path.abspath(BASE_DIR)).replace(os.sep, "/")
+
+
+def frames_key(path, grid, size, flip):
+    return f"{source_name(path)}|{grid[0]}x{grid[1]}|{size[0]}x{size[1]}|{int(flip)}"
+
+
+def file_hash(path):
+    with open(path, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def source_info(path):
+    stat = os.stat(path)
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": file_hash(path)}
+
+
+class AssetPack:
+    """Pacote aberto com mmap; devolve buffers das entradas ainda válidas"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, index_size = HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError("formato de pacote desconhecido")
+            index = json.loads(self._map[HEADER.size:HEADER.size + index_size])
+        except (struct.error, ValueError):
+            self._map.close()
+            raise
+        self._data = HEADER.size + index_size
+        self.sources = index["sources"]
+        self.frames = index["frames"]
+        self.sounds = index["sounds"]
+        self.mixer = tuple(index["mixer"]) if index["mixer"] else None
+        self._fresh = {}
+
+    def close(self):
+        try:
+            self._map.close()
+        except BufferError:
+            # Ainda há memoryviews vivas apontando para o mapa: ele fecha quando elas sumirem
+            pass
+
+    def is_fresh(self, name):
+        """A origem ainda é a mesma do pacote? (mtime/tamanho; se mudou, compara o hash)"""
+        fresh = self._fresh.get(name)
+        if fresh is None:
+            info = self.sources.get(name)
+            path = os.path.join(BASE_DIR, name)
+            if info is None or not os.path.exists(path):
+                fresh = False
+            else:
+                stat = os.stat(path)
+                fresh = (stat.st_mtime_ns == info["mtime_ns"] and stat.st_size == info["size"]) \
+                    or file_hash(path) == info["sha256"]
+            self._fresh[name] = fresh
+        return fresh
+
+    def _view(self, offset, length):
+        start = self._data + offset
+        return memoryview(self._map)[start:start + length]
+
+    def frame_buffers(self, path, grid, size, flip):
+        """(tamanho, [buffers RGBA]) dos frames, ou None se não houver entrada válida"""
+        entry = self.frames.get(frames_key(path, grid, size, flip))
+        if entry is None or not self.is_fresh(entry["source"]):
+            return None
+        return tuple(entry["size"]), [self._view(offset, length) for offset, length in entry["frames"]]
+
+    def sound_pcm(self, path):
+        """(formato do mixer, PCM) do som, ou None; não precisa do mixer aberto"""
+        entry = self.sounds.get(source_name(path))
+        if entry is None or self.mixer is None or not self.is_fresh(entry["source"]):
+            return None
+        return self.mixer, self._view(entry["offset"], entry["length"])
+
+    def sound_buffer(self, path):
+        """PCM do som no formato atual do mixer, ou None"""
+        pcm = self.sound_pcm(path)
+        if pcm is None or pcm[0] != pygame.mixer.get_init():
+            return None
+        return pcm[1]
+
+    def is_complete(self):
+        """Tudo o que o jogo usa está no pacote e em dia?"""
+        for spec in FRAME_SPECS:
+            if os.path.exists(spec[0]) and self.frame_buffers(*spec) is None:
+                return False
+        if pygame.mixer.get_init():
+            for path in SOUND_FILES:
+                if os.path.exists(path) and self.sound_buffer(path) is None:
+                    return False
+        return True
+
+
+def open_pack(path=None):
+    """Abre o pacote se ele existir e for legível; senão None"""
+    path = path or pack_path()
+    if not os.path.exists(path):
+        return None
+    try:
+        return AssetPack(path)
+    except (OSError, ValueError, KeyError, struct.error):
+        return None
+
+
+def build_pack(path=None, old=None):
+    """
+    Gera o pacote. Entradas ainda válidas de old são copiadas sem reprocessar;
+    o resto é decodificado, recortado e escalado de novo. Retorna (refeitas, copiadas).
+    """
+    path = path or pack_path()
+    mixer = pygame.mixer.get_init()
+    if mixer is None and old is not None:
+        # Sem mixer aberto (o jogo só abre no 1º som) não dá para decodificar:
+        # os sons ainda válidos do pacote antigo seguem no formato em que estão
+        mixer = old.mixer
+    data = bytearray()
+    sources = {}
+    frames = {}
+    sounds = {}
+    rebuilt = reused = 0
+
+    def add(buffer):
+        offset = len(data)
+        data.extend(buffer)
+        return [offset, len(buffer)]
+
+    sheets = {}
+    for spec in FRAME_SPECS:
+        source = spec[0]
+        if not os.path.exists(source):
+            continue
+        name = source_name(source)
+        key = frames_key(*spec)
+        cached = old.frame_buffers(*spec) if old is not None else None
+        if cached is not None:
+            size, buffers = cached
+            reused += 1
+        else:
+            sheet = sheets.get(source)
+            if sheet is None:
+                sheet = sheets[source] = pygame.image.load(source)
+            surfaces = cut_frames(sheet, spec[1], spec[2], spec[3])
+            size = surfaces[0].get_size()
+            buffers = [pygame.image.tobytes(surface, "RGBA") for surface in surfaces]
+            rebuilt += 1
+        frames[key] = {"source": name, "size": list(size), "frames": [add(buffer) for buffer in buffers]}
+        sources[name] = source_info(source)
+
+    if mixer:
+        for source in SOUND_FILES:
+            if not os.path.exists(source):
+                continue
+            name = source_name(source)
+            pcm = old.sound_pcm(source) if old is not None else None
+            if pcm is not None and pcm[0] == mixer:
+                buffer = pcm[1]
+                reused += 1
+            elif pygame.mixer.get_init() == mixer:
+                buffer = pygame.mixer.Sound(source).get_raw()
+                rebuilt += 1
+            else:
+                continue
+            offset, length = add(buffer)
+            sounds[name] = {"source": name, "offset": offset, "length": length}
+            sources[name] = source_info(source)
+
+    index = json.dumps({
+        "sources": sources,
+        "frames": frames,
+        "sounds": sounds,
+        "mixer": list(mixer) if mixer else None,
+    }).encode()
+
+    cached = buffers = buffer = pcm = None  # solta as views do pacote antigo
+
+    # Grava num temporário e troca no fim: quem estiver lendo o antigo não vê lixo
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(index)))
+        file.write(index)
+        file.write(data)
+    if old is not None:
+        old.close()
+    os.replace(temp_path, path)
+    return rebuilt, reused
+
+
+def ensure_pack(path=None):
+    """Abre o pacote, refazendo antes o que estiver faltando ou desatualizado"""
+    path = path or pack_path()
+    pack = open_pack(path)
+    if pack is not None and pack.is_complete():
+        return pack
+    build_pack(path, pack)
+    return open_pack(path)
+
+
+def update_pack_async(path=None):
+    """
+    Atualiza o pacote numa thread (ex.: acrescenta os sons depois que o mixer
+    abriu, no formato dele). Frames em dia são copiados, não refeitos.
+    """
+    def work():
+        try:
+            old = open_pack(path)
+            if old is not None and old.is_complete():
+                old.close()
+                return
+            build_pack(path, old)
+        except (OSError, pygame.error) as error:
+            print(f"Aviso: não foi possível atualizar o pacote de assets: {error}")
+
+    thread = threading.Thread(target=work, name="asset-pack", daemon=True)
+    thread.start()
+    return thread
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera o pacote de assets pré-processados")
+    parser.add_argument("--force", action="store_true", help="refaz todas as entradas")
+    parser.add_argument("--output", default=None, help=f"caminho do pacote (padrão {ASSET_PACK})")
+    args = parser.parse_args(argv)
+
+    # Os sons são gravados no formato padrão do mixer (o mesmo que o jogo usa)
+    try:
+        pygame.mixer.init()
+    except pygame.error as error:
+        print(f"Aviso: sem mixer ({error}); o pacote vai só com as imagens")
+
+    path = args.output or pack_path()
+    old = None if args.force else open_pack(path)
+    start = time.perf_counter()
+    rebuilt, reused = build_pack(path, old)
+    print(f"Pacote {path}: {rebuilt} entradas refeitas, {reused} reaproveitadas, "
+          f"{os.path.getsize(path) / 1024:.0f} KB em {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
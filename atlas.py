@@ -0,0 +1,92 @@
+import pygame
+from settings import ATLAS_PAGE_SIZE
+
+# Atlas de texturas: os frames pequenos (player, Malware, rotações do tiro,
+# DataDrop) são copiados para poucas páginas grandes e o desenho passa a
+# blitar regiões delas. Menos superfícies soltas = melhor localidade de cache
+# e menos overhead por superfície, e já é o formato que uma textura de GPU pede.
+
+
+class TextureAtlas:
+    """
+    Páginas de ATLAS_PAGE_SIZE x ATLAS_PAGE_SIZE preenchidas em prateleiras
+    (shelf packing), com a tabela superfície original -> (página, Rect).
+
+    As superfícies originais continuam valendo: region() só troca pela página
+    quando a cópia ainda representa o que a original desenharia (sem colorkey
+    e com alpha de superfície 255; a cópia translúcida do piscar de dano do
+    player, por exemplo, nem está no atlas e é desenhada solta).
+    """
+
+    def __init__(self, page_size=ATLAS_PAGE_SIZE, padding=1):
+        self.page_size = page_size
+        self.padding = padding
+        self.pages = []
+        self.regions = {}
+        # Por página: lista de prateleiras [y, altura, próximo x] e a próxima altura livre
+        self._shelves = []
+        self._next_y = []
+
+    def add_all(self, surfaces):
+        """Copia as superfícies para o atlas (as mais altas primeiro: menos sobra nas prateleiras)"""
+        unique = {surface: None for surface in surfaces if surface not in self.regions}
+        for surface in sorted(unique, key=lambda surface: surface.get_height(), reverse=True):
+            self.add(surface)
+        return self
+
+    def add(self, surface):
+        """Copia uma superfície para o atlas; False se ela não pode entrar"""
+        if surface in self.regions:
+            return True
+        if surface.get_colorkey() is not None or surface.get_alpha() not in (None, 255):
+            return False
+        width, height = surface.get_size()
+        if width + self.padding > self.page_size or height + self.padding > self.page_size:
+            return False
+
+        page_index, position = self._place(width + self.padding, height + self.padding)
+        page = self.pages[page_index]
+        # BLEND_RGBA_MAX sobre a página zerada copia os pixels (inclusive o alpha) sem misturar
+        page.blit(surface, position, special_flags=pygame.BLEND_RGBA_MAX)
+        self.regions[surface] = (page, pygame.Rect(position, (width, height)))
+        return True
+
+    def _place(self, width, height):
+        for index, shelves in enumerate(self._shelves):
+            for shelf in shelves:
+                y, shelf_height, x = shelf
+                if height <= shelf_height and x + width <= self.page_size:
+                    shelf[2] = x + width
+                    return index, (x, y)
+            if self._next_y[index] + height <= self.page_size:
+                return index, self._new_shelf(index, width, height)
+
+        # Nenhuma página tem espaço: abre outra
+        page = pygame.Surface((self.page_size, self.page_size), pygame.SRCALPHA)
+        if pygame.display.get_surface() is not None:
+            page = page.convert_alpha()
+        page.fill((0, 0, 0, 0))
+        self.pages.append(page)
+        self._shelves.append([])
+        self._next_y.append(0)
+        return len(self.pages) - 1, self._new_shelf(len(self.pages) - 1, width, height)
+
+    def _new_shelf(self, index, width, height):
+        y = self._next_y[index]
+        self._shelves[index].append([y, height, width])
+        self._next_y[index] = y + height
+        return 0, y
+
+    def region(self, surface):
+        """(fonte, área) para desenhar surface: região da página, ou (surface, None)"""
+        entry = self.regions.get(surface)
+        if entry is None or surface.get_alpha() not in (None, 255):
+            return surface, None
+        return entry
+
+    def stats(self):
+        return {
+            'pages': len(self.pages),
+            'regions': len(self.regions),
+            'page_size': self.page_size,
+        }
@@ -0,0 +1 @@
+"""Benchmarks de desempenho. Rode a partir da raiz: python -m benchmarks.<nome>"""
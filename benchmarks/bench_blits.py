@@ -0,0 +1,89 @@
+"""
+Blit por sprite x submissão em lote (Surface.blits / fblits).
+
+Compara o laço antigo do CameraGroup (um blit por sprite, posição via Vector2)
+com a sequência única enviada de uma vez, com e sem agrupar por superfície.
+
+    python -m benchmarks.bench_blits
+"""
+import random
+import sys
+
+from benchmarks.common import init_headless_display, time_per_call
+
+screen = init_headless_display()
+
+import pygame
+from settings import WIDTH, HEIGHT
+
+REPEAT = 50
+COUNTS = (100, 1_000, 5_000)
+
+
+def _make_surfaces():
+    # Poucas superfícies compartilhadas, como no jogo (frames de inimigo, tiro, XP)
+    surfaces = []
+    for size, color in ((62, (255, 50, 50)), (62, (200, 40, 40)), (62, (255, 255, 255)),
+                        (78, (255, 255, 0)), (8, (170, 255, 0))):
+        surface = pygame.Surface((size, size), pygame.SRCALPHA)
+        surface.fill(color + (200,))
+        surfaces.append(surface.convert_alpha())
+    return surfaces
+
+
+def _make_sprites(count, surfaces):
+    rng = random.Random(count)
+    sprites = []
+    for _ in range(count):
+        image = rng.choice(surfaces)
+        rect = image.get_rect(topleft=(rng.randint(0, WIDTH), rng.randint(0, HEIGHT)))
+        sprites.append((image, rect))
+    return sprites
+
+
+def per_sprite(sprites, offset):
+    for image, rect in sprites:
+        screen.blit(image, rect.topleft - offset)
+
+
+def batched(sprites, offset):
+    ox, oy = int(offset.x), int(offset.y)
+    screen.blits([(image, (rect.x - ox, rect.y - oy)) for image, rect in sprites], doreturn=False)
+
+
+def batched_grouped(sprites, offset):
+    ox, oy = int(offset.x), int(offset.y)
+    batches = {}
+    for image, rect in sprites:
+        batches.setdefault(image, []).append((rect.x - ox, rect.y - oy))
+    sequence = [(image, pos) for image, positions in batches.items() for pos in positions]
+    screen.blits(sequence, doreturn=False)
+
+
+def fblits_grouped(sprites, offset):
+    ox, oy = int(offset.x), int(offset.y)
+    batches = {}
+    for image, rect in sprites:
+        batches.setdefault(image, []).append((rect.x - ox, rect.y - oy))
+    screen.fblits([(image, pos) for image, positions in batches.items() for pos in positions])
+
+
+def main():
+    surfaces = _make_surfaces()
+    offset = pygame.math.Vector2(0, 0)
+
+    variants = [("blit por sprite", per_sprite), ("blits", batched), ("blits agrupado", batched_grouped)]
+    if hasattr(screen, "fblits"):
+        variants.append(("fblits agrupado", fblits_grouped))
+
+    print(f"{'variante':<18}" + "".join(f"{count:>12}" for count in COUNTS))
+    for name, func in variants:
+        row = []
+        for count in COUNTS:
+            sprites = _make_sprites(count, surfaces)
+            row.append(time_per_call(lambda: func(sprites, offset), REPEAT))
+        print(f"{name:<18}" + "".join(f"{ms:>10.3f}ms" for ms in row))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
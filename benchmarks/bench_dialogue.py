@@ -0,0 +1,50 @@
+"""
+Custo por frame de DialogueSystem.execute com um diálogo parado na tela.
+
+"sem cache" recompõe a caixa em todo frame (quebra de linha, render das
+linhas e escala do avatar, como o código fazia antes); "com cache" é o caminho
+normal, em que a caixa composta é reaproveitada.
+
+    python -m benchmarks.bench_dialogue
+"""
+import sys
+
+from benchmarks.common import init_headless_display, time_per_call
+
+screen = init_headless_display()
+
+import pygame
+from fonts import text_cache
+from main import WAVE_TIPS
+from sprites import Player
+from ui import DialogueSystem
+
+FRAMES = 300
+
+
+def main():
+    player = Player((0, 0), [pygame.sprite.Group()], pygame.sprite.Group(), lambda *args: None)
+    dialogue = DialogueSystem(player)
+    text = WAVE_TIPS[4] + " (Pressione ESPAÇO para continuar)"
+    title = "TUX AI [RELATÓRIO HORDA 4]:"
+
+    def uncached():
+        dialogue._panels.clear()
+        dialogue._avatar = None
+        text_cache.clear()
+        dialogue.execute(text, title)
+
+    def cached():
+        dialogue.execute(text, title)
+
+    before = time_per_call(uncached, FRAMES)
+    cached()  # primeiro frame monta o painel
+    after = time_per_call(cached, FRAMES)
+
+    print(f"{'sem cache':<12}{before:>9.3f} ms/frame")
+    print(f"{'com cache':<12}{after:>9.3f} ms/frame")
+    print(f"ganho: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+Custo por frame das telas cheias (game over, vitória, pausa e início).
+
+"sem cache" descarta as camadas e os textos a cada frame e deixa o código
+novo recompor tudo: é uma aproximação do caminho antigo (Surface nova, fill,
+borda e render de todos os textos), não o código antigo rodando. "com cache"
+é o caminho normal, que só blita o fundo e os textos já prontos.
+
+Além do tempo, conta as alocações de pixels por frame (que ficam com o SDL e
+não aparecem no tracemalloc): Surfaces criadas com pygame.Surface e textos
+renderizados com Font.render, contados por subclasses instaladas só no benchmark.
+
+    python -m benchmarks.bench_overlays
+"""
+import sys
+
+from benchmarks.common import init_headless_display, time_per_call
+
+screen = init_headless_display()
+
+import pygame
+from fonts import text_cache
+from sprites import Player
+from ui import GameOverScreen, VictoryScreen, PauseScreen, StartScreen
+
+FRAMES = 200
+
+
+# Contadores de alocação: Surfaces novas e textos renderizados
+counts = {"surfaces": 0, "renders": 0}
+
+
+class CountingSurface(pygame.Surface):
+    def __init__(self, *args, **kwargs):
+        counts["surfaces"] += 1
+        super().__init__(*args, **kwargs)
+
+
+class CountingFont(pygame.font.Font):
+    def render(self, *args, **kwargs):
+        counts["renders"] += 1
+        return super().render(*args, **kwargs)
+
+
+def allocations_per_frame(func, frames=FRAMES):
+    """(Surfaces, textos renderizados) criados em média por chamada de func"""
+    surface = pygame.Surface
+    pygame.Surface = CountingSurface
+    counts["surfaces"] = counts["renders"] = 0
+    try:
+        for _ in range(frames):
+            func()
+    finally:
+        pygame.Surface = surface
+    return counts["surfaces"] / frames, counts["renders"] / frames
+
+
+def main():
+    # As fontes das telas são criadas abaixo, já com o render contado
+    pygame.font.Font = CountingFont
+    player = Player((0, 0), [pygame.sprite.Group()], pygame.sprite.Group(), lambda *args: None)
+    player.upgrades_history = [f"> Patch {i} (v1.{i})" for i in range(15)]
+
+    screens = [
+        ("game over", GameOverScreen()),
+        ("vitória", VictoryScreen()),
+        ("pausa", PauseScreen(player)),
+        ("início", StartScreen()),
+    ]
+
+    print("sem cache = caches descartados a cada frame (aproximação do caminho antigo)\n")
+    print(f"{'tela':<12}{'sem cache':>12}{'com cache':>12}{'Surfaces/frame':>18}{'textos/frame':>16}")
+    for name, overlay in screens:
+        def uncached():
+            overlay.invalidate()
+            text_cache.clear()
+            overlay.display()
+
+        before = time_per_call(uncached, FRAMES)
+        before_surfaces, before_renders = allocations_per_frame(uncached)
+
+        overlay.display()  # primeiro frame compõe as camadas
+        after = time_per_call(overlay.display, FRAMES)
+        after_surfaces, after_renders = allocations_per_frame(overlay.display)
+
+        surfaces = f"{before_surfaces:g} -> {after_surfaces:g}"
+        renders = f"{before_renders:g} -> {after_renders:g}"
+        print(f"{name:<12}{before:>10.3f}ms{after:>10.3f}ms{surfaces:>18}{renders:>16}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+"""
+Suíte de cenários: como o tempo de frame escala com o tamanho do jogo.
+
+Monta o Game em modo headless, injeta um cenário (muitos Malware, tiro pesado,
+milhares de DataDrop perto do player) e roda, tick a tick, o Game.step() e o
+Game.draw() de verdade com o FrameProfiler ligado; as fases vêm das marcas do
+próprio jogo (média e p99 em ms). O resultado vai para um JSON; o comando
+compare aponta regressões contra um baseline guardado.
+
+    python -m benchmarks.bench_scenarios run [--ticks 300] [--only malware_2000 ...] [--output arquivo.json]
+    python -m benchmarks.bench_scenarios compare baseline.json atual.json [--threshold 0.15]
+"""
+import argparse
+import contextlib
+import io
+import json
+import math
+import platform
+import sys
+import time
+
+from benchmarks.common import init_headless_display
+
+init_headless_display()
+
+import pygame
+from settings import MAP_SIZE, MAGNET_RADIUS
+from sprites import DataDrop
+from inputs import ScriptedInput
+from swarm import HAS_NUMPY
+import main
+
+PHASES = ("update", "collision", "draw", "frame")
+
+# Fases do FrameProfiler somadas em cada fase do relatório ("frame" = todas)
+PROFILER_PHASES = {
+    "update": ("update", "swarm"),
+    "collision": ("collision",),
+    "draw": ("draw", "ui", "dialogue"),
+}
+DEFAULT_OUTPUT = "bench_scenarios.json"
+
+# Ruído abaixo disso (ms) não conta como regressão, por maior que seja a razão
+MIN_DELTA_MS = 0.05
+
+
+# ---------------- CENÁRIOS -----------------
+
+def add_malware(game, count):
+    for _ in range(count):
+        game.create_enemy((game.rng.uniform(0, MAP_SIZE), game.rng.uniform(0, MAP_SIZE)))
+
+
+def add_data_drops(game, count):
+    cx, cy = game.player.rect.center
+    groups = [game.visible_sprites, game.active_sprites, game.data_sprites]
+    for _ in range(count):
+        angle = game.rng.uniform(0, 2 * math.pi)
+        radius = game.rng.uniform(MAGNET_RADIUS // 2, MAGNET_RADIUS * 3)
+        DataDrop((cx + radius * math.cos(angle), cy + radius * math.sin(angle)), game.player, groups)
+
+
+def heavy_fire(game, shots=40):
+    # Além do tiro automático (sem cooldown), uma rajada em leque por tick
+    for _ in range(shots):
+        angle = game.rng.uniform(0, 2 * math.pi)
+        game.create_projectile(game.player.rect.center, pygame.math.Vector2(math.cos(angle), math.sin(angle)))
+
+
+def refill_data_drops(game, count):
+    missing = count - len(game.data_sprites)
+    if missing > 0:
+        add_data_drops(game, missing)
+
+
+def _no_cooldown(game):
+    game.player.projectile_cooldown = 0
+
+
+# nome -> (preparação, ação extra por tick)
+SCENARIOS = {
+    "malware_100": (lambda game: add_malware(game, 100), None),
+    "malware_500": (lambda game: add_malware(game, 500), None),
+    "malware_2000": (lambda game: add_malware(game, 2000), None),
+    "malware_10000": (lambda game: add_malware(game, 10000), None),
+    "heavy_fire": (lambda game: (add_malware(game, 500), _no_cooldown(game)), heavy_fire),
+    "data_drops": (lambda game: add_data_drops(game, 3000), lambda game: refill_data_drops(game, 3000)),
+}
+
+
+def build_game(seed):
+    # Player parado, imortal e sem level up: o cenário não muda de estado no meio
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = main.Game(headless=True, input_source=ScriptedInput(script=[(1, ())]), seed=seed)
+    game.player.integrity = game.player.max_integrity = 10 ** 9
+    game.player.xp_to_next_level = 10 ** 9
+
+    # Horda "infinita" que não spawna sozinha (só o que o cenário colocar)
+    wave = game.wave_manager
+    wave.enemies_in_wave = wave.enemies_spawned = 10 ** 9
+    return game
+
+
+# ---------------- MEDIÇÃO -----------------
+
+def summarize(samples_ns):
+    ordered = sorted(samples_ns)
+    p99_index = min(len(ordered) - 1, math.ceil(0.99 * len(ordered)) - 1)
+    return {
+        "mean_ms": sum(ordered) / len(ordered) / 1e6,
+        "p99_ms": ordered[p99_index] / 1e6,
+    }
+
+
+def run_scenario(name, ticks, warmup, seed):
+    setup, per_tick = SCENARIOS[name]
+    game = build_game(seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        setup(game)
+
+    # Um frame do profiler por tick: um step() e um draw(), como no Game.run
+    profiler = game.profiler
+    profiler.visible = True
+    samples = {phase: [] for phase in PHASES}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for tick in range(warmup + ticks):
+            if per_tick is not None:
+                per_tick(game)
+
+            profiler.begin_frame()
+            game.step()
+            game.draw(game.get_screen_state())
+            profiler.end_frame()
+
+            if tick >= warmup:
+                laps = profiler.last_frame()
+                for phase, parts in PROFILER_PHASES.items():
+                    samples[phase].append(sum(laps[part] for part in parts))
+                samples["frame"].append(sum(laps.values()))
+
+    result = {phase: summarize(values) for phase, values in samples.items()}
+    result["sprites"] = {
+        "enemies": len(game.enemy_sprites),
+        "projectiles": len(game.projectile_sprites),
+        "data": len(game.data_sprites),
+        "visible": len(game.visible_sprites),
+    }
+    return result
+
+
+def run(args):
+    names = args.only or list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        print(f"Cenário desconhecido: {', '.join(unknown)} (opções: {', '.join(SCENARIOS)})")
+        return 2
+
+    report = {
+        "meta": {
+            "ticks": args.ticks,
+            "warmup": args.warmup,
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "numpy": HAS_NUMPY,
+            "swarm": main.USE_SWARM_ENGINE and HAS_NUMPY,
+            "machine": platform.machine(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "scenarios": {},
+    }
+
+    print("média / p99 por tick, em ms\n")
+    print(f"{'cenário':<16}" + "".join(f"{phase:>20}" for phase in PHASES))
+    for name in names:
+        result = run_scenario(name, args.ticks, args.warmup, args.seed)
+        report["scenarios"][name] = result
+        row = "".join(f"{result[p]['mean_ms']:>10.3f} /{result[p]['p99_ms']:>8.3f}" for p in PHASES)
+        print(f"{name:<16}{row}")
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print(f"\nResultados salvos em {args.output}")
+    return 0
+
+
+def compare(args):
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)["scenarios"]
+    with open(args.current, encoding="utf-8") as file:
+        current = json.load(file)["scenarios"]
+
+    regressions = []
+    print(f"{'cenário':<16}{'fase':<11}{'métrica':<9}{'baseline':>10}{'atual':>10}{'razão':>8}")
+    for name, result in current.items():
+        if name not in baseline:
+            continue
+        for phase in PHASES:
+            for metric in ("mean_ms", "p99_ms"):
+                before = baseline[name][phase][metric]
+                after = result[phase][metric]
+                ratio = after / before if before else float("inf")
+                regressed = ratio > 1 + args.threshold and after - before > MIN_DELTA_MS
+                flag = "  << REGRESSÃO" if regressed else ""
+                print(f"{name:<16}{phase:<11}{metric[:-3]:<9}{before:>10.3f}{after:>10.3f}{ratio:>8.2f}{flag}")
+                if regressed:
+                    regressions.append((name, phase, metric))
+
+    if regressions:
+        print(f"\n{len(regressions)} regressão(ões) acima de {args.threshold:.0%}")
+        return 1
+    print(f"\nNenhuma regressão acima de {args.threshold:.0%}")
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de cenários (headless)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="roda os cenários e salva o JSON")
+    run_parser.add_argument("--ticks", type=int, default=300, help="ticks medidos por cenário")
+    run_parser.add_argument("--warmup", type=int, default=30, help="ticks descartados antes de medir")
+    run_parser.add_argument("--seed", type=int, default=1)
+    run_parser.add_argument("--only", nargs="+", metavar="CENÁRIO", help=f"subconjunto de: {', '.join(SCENARIOS)}")
+    run_parser.add_argument("--output", default=DEFAULT_OUTPUT)
+
+    compare_parser = commands.add_parser("compare", help="compara um resultado com o baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.15,
+                                help="aumento relativo que conta como regressão (0.15 = 15%%)")
+    return parser.parse_args(argv)
+
+
+def main_cli(argv=None):
+    args = parse_args(argv)
+    if args.command == "run":
+        return run(args)
+    return compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,91 @@
+"""
+Quantos Malware cabem em um frame de 60 FPS, com e sem o SwarmEngine.
+
+Mede só o custo de mover o enxame (o que Malware.update / SwarmEngine.update
+fazem por tick) e procura o maior número de inimigos cujo passo cabe no
+orçamento de 1000 / FPS ms.
+
+    python -m benchmarks.bench_swarm
+"""
+import random
+import sys
+
+from benchmarks.common import init_headless_display, time_per_call
+
+init_headless_display()
+
+import pygame
+from settings import FPS, WIDTH, HEIGHT
+from sprites import Malware
+from swarm import SwarmEngine, HAS_NUMPY
+
+FRAME_BUDGET_MS = 1000 / FPS
+TICKS = 30
+
+
+class _Target(pygame.sprite.Sprite):
+    """Player mínimo: só o rect que os inimigos perseguem"""
+
+    def __init__(self):
+        super().__init__()
+        self.rect = pygame.Rect(0, 0, 96, 96)
+        self.rect.center = (1000, 1000)
+
+
+def _build(count, use_swarm):
+    rng = random.Random(count)
+    player = _Target()
+    group = pygame.sprite.Group()
+    swarm = SwarmEngine() if use_swarm else None
+    for _ in range(count):
+        pos = (rng.uniform(0, 2000), rng.uniform(0, 2000))
+        Malware(pos, player, [group], swarm=swarm)
+
+    view_rect = pygame.Rect(0, 0, WIDTH, HEIGHT)
+    view_rect.center = player.rect.center
+
+    if swarm is not None:
+        return lambda: swarm.update(player.rect.center, pygame.time.get_ticks(), view_rect)
+    return group.update
+
+
+def tick_ms(count, use_swarm):
+    step = _build(count, use_swarm)
+    step()  # aquece
+    return time_per_call(step, TICKS)
+
+
+def max_enemies(use_swarm, limit=200_000):
+    """Maior contagem cujo tick cabe no orçamento do frame (busca por dobra + bisseção)"""
+    low, high = 0, 100
+    while high <= limit and tick_ms(high, use_swarm) <= FRAME_BUDGET_MS:
+        low, high = high, high * 2
+    high = min(high, limit)
+
+    while high - low > max(50, low // 50):
+        mid = (low + high) // 2
+        if tick_ms(mid, use_swarm) <= FRAME_BUDGET_MS:
+            low = mid
+        else:
+            high = mid
+    return low
+
+
+def main():
+    paths = [("por sprite", False)]
+    if HAS_NUMPY:
+        paths.append(("SwarmEngine", True))
+    else:
+        print("NumPy não instalado: medindo só o caminho por sprite.")
+
+    print(f"Orçamento por frame: {FRAME_BUDGET_MS:.2f} ms ({FPS} FPS)\n")
+    print(f"{'caminho':<14}{'100':>10}{'1000':>10}{'5000':>10}{'máx @60FPS':>14}")
+    for name, use_swarm in paths:
+        samples = [tick_ms(count, use_swarm) for count in (100, 1000, 5000)]
+        best = max_enemies(use_swarm)
+        row = "".join(f"{ms:>8.2f}ms" for ms in samples)
+        print(f"{name:<14}{row}{best:>14}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,22 @@
+import os
+import time
+
+
+def init_headless_display():
+    """Inicializa o pygame sem janela nem áudio e cria um display do tamanho do jogo"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    import pygame
+    from settings import WIDTH, HEIGHT
+
+    pygame.init()
+    return pygame.display.set_mode((WIDTH, HEIGHT))
+
+
+def time_per_call(func, repeat):
+    """Tempo médio (ms) de func() ao longo de repeat chamadas"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) * 1000 / repeat
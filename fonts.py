@@ -0,0 +1,172 @@
+import json
+import os
+import time
+from collections import OrderedDict
+
+import pygame
+from settings import *
+
+# Registro de fontes: cada (nome, tamanho, negrito) é resolvido uma vez só
+_fonts = {}
+
+# Resolução nome -> arquivo, guardada em disco entre execuções. A primeira
+# busca no sistema (no Linux, uma varredura do fontconfig) é a parte lenta do
+# SysFont; com o cache o jogo abre o arquivo direto.
+FONT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), FONT_CACHE)
+_resolved = None
+
+# Pastas de fontes do sistema (as que não existirem são ignoradas). Instalar
+# uma fonte muda o mtime delas: aí os "não encontrada" do cache são refeitos
+_home = os.path.expanduser("~")
+FONT_DIRS = (
+    "/usr/share/fonts", "/usr/local/share/fonts",
+    os.path.join(_home, ".fonts"), os.path.join(_home, ".local", "share", "fonts"),
+    "/Library/Fonts", "/System/Library/Fonts", os.path.join(_home, "Library", "Fonts"),
+    os.path.join(os.environ.get("WINDIR", "C:\\Windows"), "Fonts"),
+    os.path.join(os.environ.get("LOCALAPPDATA", _home), "Microsoft", "Windows", "Fonts"),
+)
+_stamp = None
+
+# Para o --startup-trace
+font_stats = {'resolvidas': 0, 'do cache': 0, 'tempo': 0.0}
+
+
+def fonts_stamp():
+    """Maior mtime das pastas de fontes e das subpastas diretas (muda ao instalar uma fonte)"""
+    global _stamp
+    if _stamp is None:
+        _stamp = 0
+        for directory in FONT_DIRS:
+            try:
+                _stamp = max(_stamp, os.stat(directory).st_mtime_ns)
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir():
+                            _stamp = max(_stamp, entry.stat().st_mtime_ns)
+            except OSError:
+                continue
+    return _stamp
+
+
+def _load_resolved():
+    try:
+        with open(FONT_CACHE_PATH, encoding="utf-8") as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or not isinstance(data.get("fonts"), dict):
+        return {}
+
+    resolved = {}
+    for key, entry in data["fonts"].items():
+        if not (isinstance(entry, list) and len(entry) == 2 and (entry[0] is None or isinstance(entry[0], str))):
+            continue
+        # "Não encontrada" só vale enquanto as pastas de fontes não mudarem
+        if entry[0] is None and data.get("stamp") != fonts_stamp():
+            continue
+        resolved[key] = entry
+    return resolved
+
+
+def _save_resolved():
+    try:
+        with open(FONT_CACHE_PATH, "w", encoding="utf-8") as file:
+            json.dump({"stamp": fonts_stamp(), "fonts": _resolved}, file, indent=1)
+    except OSError:
+        pass  # sem escrita na pasta: só perde o cache
+
+
+def resolve_font(name, bold=False):
+    """
+    (arquivo ou None, negrito sintético) que o SysFont usaria para a fonte.
+    None = fonte não encontrada (usa a padrão do pygame).
+    """
+    global _resolved
+    if _resolved is None:
+        _resolved = _load_resolved()
+
+    key = f"{name}|{int(bold)}"
+    entry = _resolved.get(key)
+    if entry is not None and (entry[0] is None or os.path.exists(entry[0])):
+        font_stats['do cache'] += 1
+        return entry
+
+    path = pygame.font.match_font(name, bold=bold)
+    # Sem arquivo negrito próprio o SysFont usa o normal com set_bold
+    fake_bold = bold and (path is None or path == pygame.font.match_font(name))
+    entry = [path, fake_bold]
+    _resolved[key] = entry
+    _save_resolved()
+    font_stats['resolvidas'] += 1
+    return entry
+
+
+def get_font(name, size, bold=False):
+    """Equivalente a pygame.font.SysFont, mas sem repetir a busca no sistema"""
+    key = (name, size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        start = time.perf_counter()
+        path, fake_bold = resolve_font(name, bold)
+        font = pygame.font.Font(path, size)
+        if fake_bold:
+            font.set_bold(True)
+        _fonts[key] = font
+        font_stats['tempo'] += time.perf_counter() - start
+    return font
+
+
+class TextCache:
+    """
+    Cache LRU de textos renderizados, indexado por (fonte, texto, cor).
+
+    As superfícies devolvidas são compartilhadas: podem ser blitadas à vontade,
+    mas não devem ser alteradas por quem chamou.
+    """
+
+    def __init__(self, max_size=TEXT_CACHE_SIZE):
+        self.max_size = max_size
+        self._surfaces = OrderedDict()
+
+        # Estatísticas para profiling
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, color, antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_size:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self._surfaces),
+            'hit_rate': self.hit_rate(),
+        }
+
+    def clear(self):
+        self._surfaces.clear()
+
+
+# Instância única compartilhada pelo HUD e por todas as telas
+text_cache = TextCache()
+
+
+def render_text(font, text, color, antialias=True):
+    """Renderiza (ou reaproveita) o texto; mesma assinatura de uso de font.render"""
+    return text_cache.render(font, text, tuple(color), antialias)
@@ -0,0 +1,276 @@
+import math
+import pygame
+from settings import *
+
+
+class SpatialGroup(pygame.sprite.Group):
+    """
+    Grupo de sprites com uma grade uniforme (spatial hash) por trás.
+
+    Cada sprite fica registrado nas células que o seu rect ocupa, então as
+    consultas de colisão só testam quem está perto em vez do grupo inteiro.
+    Entradas e saídas do grupo atualizam a grade na hora; movimento não, por
+    isso quem mexe nos sprites deve chamar rebuild() antes das consultas.
+
+    Os resultados saem sempre na ordem de iteração do grupo, igual às funções
+    de pygame.sprite.
+    """
+
+    def __init__(self, *sprites, cell_size=SPATIAL_CELL_SIZE):
+        self.cell_size = cell_size
+        self._cells = {}          # (col, row) -> lista de sprites
+        self._sprite_cells = {}   # sprite -> células em que está registrado
+        self._order = {}          # sprite -> ordem de entrada no grupo
+        self._pending = []        # sprites que entraram antes de ter rect
+        self._bounds = None       # (col_min, row_min, col_max, row_max) ocupados
+        self._counter = 0
+        super().__init__(*sprites)
+
+    # ---------------- MANUTENÇÃO DA GRADE -----------------
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite)
+        self._order[sprite] = self._counter
+        self._counter += 1
+        # Os sprites do jogo entram nos grupos antes de criar o rect
+        # (super().__init__(groups)), então a inserção pode ficar para depois
+        if hasattr(sprite, 'rect'):
+            self._insert(sprite)
+        else:
+            self._pending.append(sprite)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self._discard(sprite)
+        del self._order[sprite]
+
+    def _cell_range(self, rect):
+        size = self.cell_size
+        col_start = rect.left // size
+        row_start = rect.top // size
+        col_end = max(col_start, (rect.right - 1) // size)
+        row_end = max(row_start, (rect.bottom - 1) // size)
+        return col_start, row_start, col_end, row_end
+
+    def _insert(self, sprite):
+        col_start, row_start, col_end, row_end = self._cell_range(sprite.rect)
+        keys = []
+        for col in range(col_start, col_end + 1):
+            for row in range(row_start, row_end + 1):
+                key = (col, row)
+                cell = self._cells.get(key)
+                if cell is None:
+                    self._cells[key] = [sprite]
+                else:
+                    cell.append(sprite)
+                keys.append(key)
+        self._sprite_cells[sprite] = keys
+
+        # Os limites só crescem (remoções não encolhem); servem de teto para a busca
+        if self._bounds is None:
+            self._bounds = (col_start, row_start, col_end, row_end)
+        else:
+            col_min, row_min, col_max, row_max = self._bounds
+            self._bounds = (min(col_min, col_start), min(row_min, row_start),
+                            max(col_max, col_end), max(row_max, row_end))
+
+    def _discard(self, sprite):
+        for key in self._sprite_cells.pop(sprite, ()):
+            cell = self._cells[key]
+            cell.remove(sprite)
+            if not cell:
+                del self._cells[key]
+
+    def _flush_pending(self):
+        pending = self._pending
+        self._pending = []
+        for sprite in pending:
+            if sprite in self._order and sprite not in self._sprite_cells:
+                self._insert(sprite)
+
+    def rebuild(self):
+        """Recalcula as células de todos os sprites (chamar depois de movê-los)"""
+        self._cells.clear()
+        self._sprite_cells.clear()
+        self._pending = []
+        self._bounds = None
+        for sprite in self.spritedict:
+            self._insert(sprite)
+
+    # ---------------- CONSULTAS -----------------
+
+    def candidates(self, rect):
+        """Sprites registrados nas células que o rect toca (na ordem do grupo)"""
+        if self._pending:
+            self._flush_pending()
+
+        col_start, row_start, col_end, row_end = self._cell_range(rect)
+        cells = self._cells
+
+        if col_start == col_end and row_start == row_end:
+            found = list(cells.get((col_start, row_start), ()))
+        else:
+            seen = set()
+            found = []
+            for col in range(col_start, col_end + 1):
+                for row in range(row_start, row_end + 1):
+                    for sprite in cells.get((col, row), ()):
+                        if sprite not in seen:
+                            seen.add(sprite)
+                            found.append(sprite)
+
+        if len(found) > 1:
+            found.sort(key=self._order.__getitem__)
+        return found
+
+    def collide_rect(self, rect):
+        """Sprites do grupo cujo rect colide com o rect dado"""
+        return [sprite for sprite in self.candidates(rect) if rect.colliderect(sprite.rect)]
+
+    # ---------------- BUSCA POR DISTÂNCIA -----------------
+    # Distâncias medidas entre centros, sempre ao quadrado (sem raiz).
+    # Empates são resolvidos pela ordem do grupo, como num loop com "<".
+
+    def _ring(self, col, row, radius):
+        if radius == 0:
+            yield (col, row)
+            return
+        for c in range(col - radius, col + radius + 1):
+            yield (c, row - radius)
+            yield (c, row + radius)
+        for r in range(row - radius + 1, row + radius):
+            yield (col - radius, r)
+            yield (col + radius, r)
+
+    def _linear_nearest(self, pos, k, max_dist2):
+        px, py = pos
+        order = self._order
+        found = []
+        for sprite in self.spritedict:
+            cx, cy = sprite.rect.center
+            dist2 = (cx - px) * (cx - px) + (cy - py) * (cy - py)
+            if max_dist2 is None or dist2 <= max_dist2:
+                found.append((dist2, order[sprite], sprite))
+        found.sort(key=_distance_key)
+        return [entry[2] for entry in found[:k]]
+
+    def k_nearest(self, pos, k, max_radius=None):
+        """
+        Os k sprites mais próximos de pos, do mais perto para o mais longe.
+
+        Percorre a grade em anéis de células a partir da célula de pos e para
+        assim que nenhum sprite fora dos anéis vistos pode estar mais perto.
+        Se a busca for visitar mais células do que há sprites, faz a varredura
+        linear (mesmo resultado, mais barato com poucos inimigos espalhados).
+        """
+        if self._pending:
+            self._flush_pending()
+        if k <= 0 or not self.spritedict or self._bounds is None:
+            return []
+
+        max_dist2 = None if max_radius is None else max_radius * max_radius
+        px, py = pos
+        size = self.cell_size
+        col = math.floor(px / size)
+        row = math.floor(py / size)
+
+        # Último anel que ainda pode conter algum sprite
+        col_min, row_min, col_max, row_max = self._bounds
+        last_ring = max(col - col_min, col_max - col, row - row_min, row_max - row, 0)
+        if max_radius is not None:
+            last_ring = min(last_ring, math.ceil(max_radius / size) + 1)
+
+        total = len(self.spritedict)
+        if total <= SPATIAL_LINEAR_SCAN:
+            return self._linear_nearest(pos, k, max_dist2)
+
+        cells = self._cells
+        order = self._order
+        seen = set()
+        found = []
+        visited = 0
+        radius = 0
+        while True:
+            for key in self._ring(col, row, radius):
+                visited += 1
+                for sprite in cells.get(key, ()):
+                    if sprite in seen:
+                        continue
+                    seen.add(sprite)
+                    cx, cy = sprite.rect.center
+                    dist2 = (cx - px) * (cx - px) + (cy - py) * (cy - py)
+                    if max_dist2 is None or dist2 <= max_dist2:
+                        found.append((dist2, order[sprite], sprite))
+
+            if radius >= last_ring:
+                break
+
+            # Qualquer sprite ainda não visto está a pelo menos radius * size
+            if len(found) >= k:
+                found.sort(key=_distance_key)
+                if found[k - 1][0] < (radius * size) ** 2:
+                    break
+
+            if visited > total:
+                return self._linear_nearest(pos, k, max_dist2)
+            radius += 1
+
+        found.sort(key=_distance_key)
+        return [entry[2] for entry in found[:k]]
+
+    def nearest(self, pos, max_radius=None):
+        """O sprite mais próximo de pos (ou None), opcionalmente dentro de um raio"""
+        result = self.k_nearest(pos, 1, max_radius)
+        return result[0] if result else None
+
+    def within_radius(self, pos, radius):
+        """Todos os sprites com centro a até radius de pos, do mais perto ao mais longe"""
+        if self._pending:
+            self._flush_pending()
+
+        px, py = pos
+        query = pygame.Rect(0, 0, 0, 0)
+        query.width = query.height = (math.ceil(radius) + 1) * 2 + 1
+        query.center = (round(px), round(py))
+
+        max_dist2 = radius * radius
+        order = self._order
+        found = []
+        for sprite in self.candidates(query):
+            cx, cy = sprite.rect.center
+            dist2 = (cx - px) * (cx - px) + (cy - py) * (cy - py)
+            if dist2 <= max_dist2:
+                found.append((dist2, order[sprite], sprite))
+        found.sort(key=_distance_key)
+        return [entry[2] for entry in found]
+
+
+def _distance_key(entry):
+    # (distância², ordem no grupo) — nunca compara os sprites em si
+    return entry[0], entry[1]
+
+
+def spritecollide(sprite, group, dokill):
+    """Mesmo contrato de pygame.sprite.spritecollide, usando a grade quando houver"""
+    if not isinstance(group, SpatialGroup):
+        return pygame.sprite.spritecollide(sprite, group, dokill)
+
+    collided = group.collide_rect(sprite.rect)
+    if dokill:
+        for other in collided:
+            other.kill()
+    return collided
+
+
+def groupcollide(groupa, groupb, dokilla, dokillb):
+    """Mesmo contrato de pygame.sprite.groupcollide, usando a grade de groupb"""
+    crashed = {}
+    # Copia a lista se formos matar sprites de groupa durante o loop
+    sprites_a = groupa.sprites() if dokilla else groupa
+    for sprite in sprites_a:
+        collision = spritecollide(sprite, groupb, dokillb)
+        if collision:
+            crashed[sprite] = collision
+            if dokilla:
+                sprite.kill()
+    return crashed
@@ -0,0 +1,98 @@
+import pygame
+
+# Fontes de entrada do jogo. O Game e o Player não leem o teclado direto:
+# perguntam para a fonte ativa, que pode ser o teclado ou um roteiro (headless).
+#
+# Interface comum:
+#   get_pressed()            -> teclas seguradas (indexável por pygame.K_*)
+#   events(game)             -> eventos do frame (KEYDOWN, QUIT...)
+#   choose_upgrade(console)  -> índice do upgrade escolhido ou None
+#   interactive              -> True se há alguém jogando (mostra tela inicial)
+
+
+class KeyboardInput:
+    """Entrada real: teclado, fila de eventos e mouse do pygame"""
+
+    interactive = True
+
+    def get_pressed(self):
+        return pygame.key.get_pressed()
+
+    def events(self, game):
+        return pygame.event.get()
+
+    def choose_upgrade(self, console):
+        return console.get_clicked_option()
+
+
+class KeyState:
+    """Teclas seguradas no formato de pygame.key.get_pressed()"""
+
+    def __init__(self, held=()):
+        self.held = frozenset(held)
+
+    def __getitem__(self, key):
+        return key in self.held
+
+
+# Roteiro padrão: anda em quadrado (1 s para cada lado a 60 FPS)
+DEFAULT_SCRIPT = [
+    (60, (pygame.K_d,)),
+    (60, (pygame.K_s,)),
+    (60, (pygame.K_a,)),
+    (60, (pygame.K_w,)),
+]
+
+
+class ScriptedInput:
+    """
+    Entrada programável para rodar sem janela.
+
+    script: lista de (ticks, teclas) repetida em loop, ou função tick -> teclas.
+    upgrade_choice: índice do card escolhido quando o console de upgrade abre.
+    Dicas de horda são confirmadas sozinhas com ESPAÇO (auto_continue).
+    """
+
+    interactive = False
+
+    def __init__(self, script=DEFAULT_SCRIPT, upgrade_choice=0, auto_continue=True):
+        self.script = script
+        self.upgrade_choice = upgrade_choice
+        self.auto_continue = auto_continue
+        self.tick = 0
+        self.pending = []
+
+        if not callable(script):
+            self.script_length = sum(duration for duration, _ in script)
+
+    def press(self, key):
+        """Agenda um KEYDOWN para o próximo frame"""
+        self.pending.append(pygame.event.Event(pygame.KEYDOWN, key=key))
+
+    def held_keys(self, tick):
+        if callable(self.script):
+            return self.script(tick)
+        if not self.script_length:
+            return ()
+        position = tick % self.script_length
+        for duration, keys in self.script:
+            if position < duration:
+                return keys
+            position -= duration
+        return ()
+
+    def get_pressed(self):
+        return KeyState(self.held_keys(self.tick))
+
+    def events(self, game):
+        self.tick += 1
+        if self.auto_continue and game.showing_wave_tip:
+            self.press(pygame.K_SPACE)
+
+        events, self.pending = self.pending, []
+        return events
+
+    def choose_upgrade(self, console):
+        if not console.options:
+            return None
+        return self.upgrade_choice % len(console.options)
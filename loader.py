@@ -0,0 +1,113 @@
+import os
+import queue
+import threading
+
+import pygame
+from asset_cache import frame_cache
+from asset_pack import FRAME_SPECS, SOUND_FILES, ensure_pack, open_pack
+from sound_manager import preloaded_sounds
+
+
+class AssetLoader:
+    """
+    Carrega os assets numa thread enquanto a tela inicial já está animando.
+
+    A thread abre o pacote de assets (asset_pack.py), refazendo antes só o que
+    mudou desde a última execução, e entrega buffers crus: pixels RGBA dos
+    frames já recortados/escalados e PCM dos sons. Sem pacote utilizável, cai
+    para decodificar as spritesheets (os WAVs ficam para o SoundManager, que
+    só abre o mixer no primeiro som).
+
+    O que depende do display (frombuffer + convert_alpha) é feito por poll(),
+    chamado a cada frame na thread principal, que registra o resultado no
+    frame_cache / preloaded_sounds. Quem for criado depois (Player, Malware,
+    SoundManager) já encontra tudo pronto.
+    """
+
+    def __init__(self, frame_specs=FRAME_SPECS, sounds=None):
+        if sounds is None:
+            sounds = SOUND_FILES
+        self.frame_specs = [spec for spec in frame_specs if os.path.exists(spec[0])]
+        self.sounds = [path for path in sounds if os.path.exists(path)]
+        # +1: abrir/atualizar o pacote
+        self.total = 1 + len(self.frame_specs) + len(self.sounds)
+        self.done = 0
+        self.errors = []
+        self.pack = None
+        self._results = queue.Queue()
+        self._thread = None
+
+    @property
+    def progress(self):
+        return self.done / self.total
+
+    @property
+    def finished(self):
+        return self.done == self.total
+
+    def start(self):
+        self._thread = threading.Thread(target=self._work, name="asset-loader", daemon=True)
+        self._thread.start()
+
+    def _work(self):
+        try:
+            pack = ensure_pack()
+        except (OSError, pygame.error) as error:
+            # Pasta sem escrita, por exemplo: usa o pacote que houver (ou nenhum)
+            self.errors.append(("pacote de assets", error))
+            pack = open_pack()
+        self._results.put(('pack', None, pack))
+
+        sheets = set()
+        for spec in self.frame_specs:
+            kind = 'frames'
+            try:
+                data = pack.frame_buffers(*spec) if pack is not None else None
+                if data is None:
+                    # Fora do pacote: decodifica a spritesheet (recorte fica no frame_cache).
+                    # Frames normais e espelhados vêm da mesma folha: decodifica uma vez
+                    kind = 'sheet'
+                    if spec[0] not in sheets:
+                        image = pygame.image.load(spec[0])
+                        data = (pygame.image.tobytes(image, 'RGBA'), image.get_size())
+                        sheets.add(spec[0])
+            except (pygame.error, OSError) as error:
+                self.errors.append((spec[0], error))
+                data = None
+            self._results.put((kind, spec, data))
+
+        # Sons: só o PCM do pacote (o mixer abre no 1º som; sem pacote o
+        # SoundManager decodifica o WAV nessa hora)
+        for path in self.sounds:
+            data = pack.sound_pcm(path) if pack is not None else None
+            self._results.put(('sound', path, data))
+
+    def poll(self):
+        """Finaliza o que a thread já entregou; True quando tudo estiver pronto"""
+        while True:
+            try:
+                kind, item, data = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'pack':
+                self.pack = data
+            elif data is None:
+                pass
+            elif kind == 'frames':
+                size, buffers = data
+                frames = [pygame.image.frombuffer(buffer, size, 'RGBA').convert_alpha() for buffer in buffers]
+                frame_cache.add_frames(*item, frames)
+            elif kind == 'sheet':
+                frame_cache.add_sheet(item[0], pygame.image.frombytes(*data, 'RGBA').convert_alpha())
+            else:
+                preloaded_sounds[item] = data
+            self.done += 1
+        return self.finished
+
+    def wait(self):
+        """Espera a thread e finaliza o resto (sem animar)"""
+        if self._thread is not None:
+            self._thread.join()
+        else:
+            self._work()
+        self.poll()
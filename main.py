@@ -1,8 +1,21 @@
-import pygame, sys, random, math
+import time
+IMPORT_START = time.perf_counter()  # Início das importações (--startup-trace)
+import pygame, sys, os, random, math, argparse, hashlib
 from settings import *
-from sprites import Player, Malware, Projectile, DataDrop
+from sprites import Player, Malware, Projectile, ProjectilePool, DataDrop
 from ui import UpgradeConsole, DialogueSystem, GameOverScreen, VictoryScreen, PauseScreen, StartScreen
-from sound_manager import SoundManager
+from sound_manager import SoundManager, NullSoundManager
+from fonts import get_font, render_text, font_stats
+from groups import SpatialGroup, spritecollide, groupcollide
+from swarm import SwarmEngine, HAS_NUMPY
+from timing import SimulationClock, real_clock
+from inputs import KeyboardInput, ScriptedInput
+from replay import Replay, ReplayError, RecordingInput, ReplayInput
+from profiler import FrameProfiler, ProfileCapture, StartupTrace
+from loader import AssetLoader
+from asset_cache import frame_cache
+from asset_pack import FRAME_SPECS, update_pack_async
+from atlas import TextureAtlas
 import sprites
 
 WAVE_TIPS = {
@@ -20,7 +33,10 @@ WAVE_TIPS = {
 
 class WaveManager:
     """Gerencia o sistema de hordas do jogo"""
-    def __init__(self):
+    def __init__(self, clock=None):
+        # Relógio do jogo (intervalo entre hordas)
+        self.clock = clock if clock is not None else real_clock
+
         self.current_wave = 1
         self.enemies_in_wave = WAVE_BASE_ENEMIES
         self.enemies_spawned = 0
@@ -77,7 +93,7 @@ class WaveManager:
         
         self.wave_active = False
         self.wave_break = True
-        self.break_start_time = pygame.time.get_ticks()
+        self.break_start_time = self.clock.get_ticks()
         
         # Prepara para a próxima
         self.current_wave += 1
@@ -88,7 +104,7 @@ class WaveManager:
         if self.wave_break:
             if not self.show_tip_trigger:
                 # 3 segundos de intervalo entre hordas iniciais
-                if pygame.time.get_ticks() - self.break_start_time >= 3000:
+                if self.clock.get_ticks() - self.break_start_time >= 3000:
                     return True
         
         # Se a horda está ativa e todos os inimigos foram mortos
@@ -111,7 +127,7 @@ class WaveManager:
     def get_remaining_time(self):
         """Retorna o tempo restante do intervalo em segundos"""
         if self.wave_break:
-            elapsed = pygame.time.get_ticks() - self.break_start_time
+            elapsed = self.clock.get_ticks() - self.break_start_time
             remaining = max(0, WAVE_BREAK_TIME - elapsed)
             return remaining / 1000
         return 0
@@ -121,42 +137,106 @@ class WaveManager:
         return self.enemies_in_wave - self.enemies_killed_this_wave
 
 class Game:
-    def __init__(self):
-        # Inicialização básica do Pygame
-        pygame.init()
+    def __init__(self, headless=False, input_source=None, seed=None, startup_trace=False):
+        self.launch_time = time.perf_counter()
+        self.time_to_first_frame = None
+        # Para onde foi o tempo de abertura (--startup-trace)
+        self.startup_trace = StartupTrace(IMPORT_START, enabled=startup_trace)
+        self.startup_trace.mark("importações")
+        self.headless = headless
+        self.input_source = input_source if input_source is not None else KeyboardInput()
+        # Tela inicial só quando há alguém jogando (não headless, roteiro ou replay)
+        self.show_menus = not headless and self.input_source.interactive
+
+        # Sem janela nem áudio: drivers "dummy" do SDL
+        if headless:
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            os.environ['SDL_AUDIODRIVER'] = 'dummy'
+
+        # Simulação determinística: relógio em passos fixos + RNG com semente.
+        # Mesma semente e mesmas entradas => mesmo estado, tick a tick.
+        self.sim_clock = SimulationClock(TICK_RATE)
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+
+        # Só os subsistemas usados: pygame.init() abriria também áudio,
+        # joystick etc. O mixer abre no primeiro som (SoundManager.init_audio)
+        pygame.display.init()
+        pygame.font.init()
+        self.startup_trace.mark("pygame (display + fonte)")
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         # Agora que o display foi criado, carregamos as imagens dos inimigos
         # que usam convert_alpha().
         sprites.load_enemy_images()
         pygame.display.set_caption(TITLE)
         self.clock = pygame.time.Clock()
+        # O primeiro tick liga o timer do SDL (sem pygame.init() o get_ticks ficaria em 0)
+        self.clock.tick()
+        # Ligado por telas que travam o loop (pausa, tela inicial): o run() não
+        # recupera em ticks o tempo que ficou parado nelas
+        self.discard_frame_time = False
+        # A trilha começa com o primeiro frame já na tela (start_music)
+        self.music_started = False
+        self.startup_trace.mark("janela")
+
+        # A tela inicial aparece antes do resto: os assets carregam em segundo
+        # plano enquanto ela anima, e quem é criado abaixo já os encontra prontos
+        self.start_screen = StartScreen()
+        self.startup_trace.mark("tela inicial")
+        if self.show_menus:
+            self.load_assets()
 
         # Grupos de Sprites
         self.visible_sprites = CameraGroup()
         self.active_sprites = pygame.sprite.Group()
-        self.enemy_sprites = pygame.sprite.Group()
+        self.enemy_sprites = SpatialGroup()
         self.projectile_sprites = pygame.sprite.Group()
-        self.data_sprites = pygame.sprite.Group()
+        self.data_sprites = SpatialGroup()
+
+        # Motor vetorizado dos inimigos (cai no update por sprite sem NumPy)
+        self.swarm = SwarmEngine() if USE_SWARM_ENGINE and HAS_NUMPY else None
 
-        # Sistema de Som
-        self.sound_manager = SoundManager()
+        # Pool de tiros (reaproveita os que expiraram ou acertaram)
+        self.projectile_pool = ProjectilePool([self.visible_sprites, self.active_sprites, self.projectile_sprites], clock=self.sim_clock)
+
+        # Sistema de Som (o mixer só abre no primeiro som tocado)
+        self.sound_manager = NullSoundManager() if headless else SoundManager(on_audio_ready=self.pack_decoded_sounds)
+
+        # Cronômetro por fase do frame (overlay no F3; desligado não custa quase nada)
+        self.profiler = FrameProfiler()
+        # Captura completa com cProfile (F4 ou --profile-frames)
+        self.profile_capture = ProfileCapture()
         
         # Cria o Player
         self.setup_system()
+        self.startup_trace.mark("grupos, som e player")
+
+        # Frames que a câmera desenha, juntos em poucas páginas grandes
+        if TEXTURE_ATLAS:
+            self.visible_sprites.atlas = self.build_atlas()
+            self.startup_trace.mark("atlas de texturas")
 
         # UI Elements
         self.dialogue_system = DialogueSystem(self.player)
-        self.upgrade_console = UpgradeConsole(self.player, self.dialogue_system, self.sound_manager)
+        self.upgrade_console = UpgradeConsole(self.player, self.dialogue_system, self.sound_manager, self.rng)
         self.game_over_screen = GameOverScreen()
         self.victory_screen = VictoryScreen()
         self.pause_screen = PauseScreen(self.player)
-        self.start_screen = StartScreen()
         
-        # (opcional) iniciar música de fundo já no menu:
-        self.sound_manager.play_music(loop=-1)
+        self.startup_trace.mark("interface")
 
-        # Mostrar tela inicial antes de começar o jogo
-        self.show_start_screen()
+        if self.show_menus:
+            time_to_playable = time.perf_counter() - self.launch_time
+            print(f"INICIALIZAÇÃO: primeiro frame em {self.time_to_first_frame * 1000:.0f} ms, "
+                  f"jogável em {time_to_playable * 1000:.0f} ms")
+        if self.startup_trace.enabled:
+            self.startup_trace.report()
+            print(f"  fontes: {font_stats['resolvidas']} buscadas no sistema, {font_stats['do cache']} do cache "
+                  f"({font_stats['tempo'] * 1000:.1f} ms ao todo)")
+
+        # Mostrar tela inicial antes de começar o jogo (não com roteiro/replay)
+        if self.show_menus:
+            self.show_start_screen()
 
         # Estados do Jogo
         self.game_paused = False
@@ -170,22 +250,69 @@ class Game:
         self.show_story = True
         self.story_text1 = "Atenção, estagiário: detectamos tráfego não desejado na borda da rede. Se deixarmos esses pacotes passarem, a disponibilidade dos nossos serviços será comprometida. O servidor não pode cair!"
         self.story_text2 = "Use WASD para navegar na malha de rede. Sua tarefa é mitigar os danos. Use os protocolos de defesa para neutralizar as conexões maliciosas. Colete os logs (XP) para aplicar patches de segurança manter a Integridade do sistema. Os nossos dados não podem ser corrompidos."
-        self.start_time = pygame.time.get_ticks()
+        self.start_time = self.sim_clock.get_ticks()
         self.first_enemies_killed = 0 
         
         # Quantificador de inimigos derrotados
         self.enemies_killed = 0
 
         # Sistema de Hordas
-        self.wave_manager = WaveManager()
+        self.wave_manager = WaveManager(self.sim_clock)
         self.wave_manager.start_wave(self.sound_manager)  # Inicia a primeira horda
         
         # Timer para spawn de inimigos (mais lento, controlado pelo wave_manager)
-        self.enemy_spawn_event = pygame.USEREVENT + 1
-        pygame.time.set_timer(self.enemy_spawn_event, 1000)  # Verifica a cada 1 segundo
-        
-        # Inicia música de fundo em loop
-        self.sound_manager.play_music(loop=-1)
+        # Conta no tempo do jogo, então funciona igual com o relógio virtual
+        self.spawn_interval = 1000  # Verifica a cada 1 segundo
+        self.last_spawn_check = self.sim_clock.get_ticks()
+
+    def start_music(self):
+        """Inicia a música de fundo uma vez: o mixer abre aqui, fora do tempo até o 1º frame"""
+        if not self.music_started:
+            self.music_started = True
+            self.sound_manager.play_music(loop=-1)
+
+    def load_assets(self):
+        """Anima a tela inicial com a barra de progresso enquanto o AssetLoader trabalha"""
+        loader = AssetLoader()
+        loader.start()
+        while True:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    # Termina de carregar e deixa o primeiro tick fechar o jogo
+                    loader.wait()
+                    pygame.event.post(event)
+                    break
+
+            finished = loader.poll()
+            self.start_screen.progress = loader.progress
+            self.screen.fill(COLOR_BG)
+            self.start_screen.display()
+            pygame.display.update()
+            if self.time_to_first_frame is None:
+                self.time_to_first_frame = time.perf_counter() - self.launch_time
+                self.startup_trace.mark("primeiro frame")
+            if finished:
+                break
+            self.clock.tick(60)
+
+        self.start_screen.progress = None
+        self.startup_trace.mark("assets (com a tela animando)")
+        for path, error in loader.errors:
+            print(f"Aviso: Não foi possível carregar {path}: {error}")
+
+    def pack_decoded_sounds(self, sound_manager):
+        """Sons que vieram do WAV entram no pacote (formato do mixer aberto) para a próxima execução"""
+        if sound_manager.decoded:
+            update_pack_async()
+
+    def build_atlas(self):
+        """Atlas com os frames do player, Malware, rotações do tiro e o DataDrop"""
+        surfaces = []
+        for spec in FRAME_SPECS:
+            surfaces += frame_cache.get_frames(*spec)
+        surfaces += Projectile._get_rotated_images()
+        surfaces.append(DataDrop.get_image())
+        return TextureAtlas().add_all(surfaces)
 
     def setup_system(self):
         # Note que agora passamos self.enemy_sprites e self.create_projectile
@@ -194,12 +321,14 @@ class Game:
             [self.visible_sprites, self.active_sprites],
             self.enemy_sprites,
             self.create_projectile,
-            self.sound_manager
+            self.sound_manager,
+            self.input_source,
+            self.sim_clock
         )
     
     def create_projectile(self, pos, direction):
         # Esta função é passada para o Player chamar quando quiser atirar
-        Projectile(pos, direction, [self.visible_sprites, self.active_sprites, self.projectile_sprites])
+        self.projectile_pool.acquire(pos, direction)
         # Toca som de tiro
         self.sound_manager.play_shoot()
     
@@ -210,7 +339,7 @@ class Game:
         
         # Lógica para spawnar inimigos FORA da tela
         # Escolhe um ângulo aleatório (0 a 360 graus)
-        angle = random.uniform(0, 360)
+        angle = self.rng.uniform(0, 360)
         # Define uma distância segura (Raio) maior que a tela
         radius = WIDTH // 1.5 
         
@@ -218,18 +347,30 @@ class Game:
         x = self.player.rect.centerx + radius * math.cos(math.radians(angle))
         y = self.player.rect.centery + radius * math.sin(math.radians(angle))
         
+        self.create_enemy((x, y))
+        
+        # Registra que spawnou um inimigo
+        self.wave_manager.enemy_spawned()
+
+    def create_enemy(self, pos):
+        """Cria um Malware em pos com os multiplicadores da horda atual"""
+        # Com o enxame vetorizado o inimigo não precisa do update por sprite
+        if self.swarm is not None:
+            groups = [self.visible_sprites, self.enemy_sprites]
+        else:
+            groups = [self.visible_sprites, self.active_sprites, self.enemy_sprites]
+
         # Cria o inimigo com os multiplicadores da horda atual
-        enemy = Malware(
-            (x, y), 
+        return Malware(
+            pos, 
             self.player, 
-            [self.visible_sprites, self.active_sprites, self.enemy_sprites],
+            groups,
             self.wave_manager.health_multiplier,
             self.wave_manager.speed_multiplier,
-            self.wave_manager.damage_multiplier
+            self.wave_manager.damage_multiplier,
+            swarm=self.swarm,
+            clock=self.sim_clock
         )
-        
-        # Registra que spawnou um inimigo
-        self.wave_manager.enemy_spawned()
 
 
     def pause(self):
@@ -237,174 +378,384 @@ class Game:
         
         self.pause_screen.display()
         while self.pause_menu:
+            # Fila real do pygame: a pausa não conta como tick da simulação
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
+                    # Devolve o QUIT para o próximo tick fechar o jogo com o estado inteiro
+                    pygame.event.post(event)
+                    self.pause_menu = False
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
                         self.pause_menu = False
             pygame.display.update()
             self.clock.tick(15)
+        self.discard_frame_time = True
 
-    def run(self):
+    def run(self, render_fps=FPS):
+        # Passo fixo: o tempo real do frame enche o acumulador e a simulação
+        # avança quantos ticks de TICK_RATE couberem nele; o desenho é um por
+        # frame, limitado a render_fps (0 = sem limite, acompanha a tela)
+        accumulator = 0.0
         while True:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-
-                # INPUT DE GAME OVER OU VITÓRIA
-                if self.game_over or self.game_won:
-                    if event.type == pygame.KEYDOWN:
-                        if event.key == pygame.K_SPACE:
-                            self.reset_game()
-                
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        # Jogo pausado
-                        self.pause()
-                
-                # Avançar Dica da Horda (ESPAÇO)
-                if self.showing_wave_tip and event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_SPACE:
-                        self.showing_wave_tip = False
-                        # Se passou da horda 10, vence o jogo
-                        self.wave_manager.start_wave(self.sound_manager)
-                    
-                    # Quando o timer disparar, crie um inimigo
-                if event.type == self.enemy_spawn_event and not self.game_paused and not self.show_story and not self.game_over and not self.game_won and not self.showing_wave_tip:
-                    self.spawn_enemy()
-            
-            self.screen.fill(COLOR_BG)
+            accumulator += self.clock.tick(render_fps)
+            self.profile_capture.begin_frame()
+            self.profiler.begin_frame()
 
+            steps = 0
+            while accumulator >= self.sim_clock.step_ms:
+                if steps == MAX_FRAME_STEPS:
+                    # Muito atrasado (pausa, janela arrastada...): descarta o resto
+                    accumulator = 0.0
+                    break
+                self.step()
+                accumulator -= self.sim_clock.step_ms
+                steps += 1
+                if self.discard_frame_time:
+                    break
 
-            # LÓGICA DE VITÓRIA / DERROTA
-            if self.game_over:
-                self.visible_sprites.custom_draw(self.player)
-                self.game_over_screen.display()
-            
-            elif self.game_won:
-                # Desenha o jogo ao fundo
-                self.visible_sprites.custom_draw(self.player)
-                # Desenha tela de vitória
-                self.victory_screen.display()
-        
-            elif self.game_paused:
-                 self.visible_sprites.custom_draw(self.player)
-                 self.upgrade_console.display()
-                 if self.upgrade_console.update():
-                    self.game_paused = False
+            if self.discard_frame_time:
+                # Voltando de uma tela que travou o loop: o tempo parado nela
+                # (e o que sobrou do frame) não vira ticks de recuperação
+                self.discard_frame_time = False
+                accumulator = 0.0
+                self.clock.tick()
+
+            # Sons pedidos pelos ticks deste frame: um por tipo, volume pela quantidade
+            self.sound_manager.flush()
+            if self.startup_trace.enabled and self.sound_manager.init_time is not None:
+                # O mixer abre no primeiro som, já com o jogo rodando: entra à parte
+                print(f"INICIALIZAÇÃO: áudio aberto no primeiro som em {self.sound_manager.init_time * 1000:.1f} ms")
+                self.startup_trace.enabled = False
+
+            # Fração do próximo tick que já passou: base da interpolação do desenho
+            alpha = accumulator / self.sim_clock.step_ms
+            self.draw(self.get_screen_state(), alpha)
+
+            # Overlay do profiler (F3) e apresentação do frame entram em 'present'
+            self.profiler.draw(self.screen, self.get_group_counts())
+            pygame.display.update()
+            if not self.music_started:
+                self.start_music()
+            self.profiler.lap('present')
+            self.profiler.end_frame()
+            self.profile_capture.end_frame()
+
+    def run_headless(self, max_ticks=None, max_waves=None, stop_at_end=True):
+        """
+        Roda a simulação sem desenhar, o mais rápido que a CPU deixar.
+        stop_at_end=False segue rodando depois de game over/vitória (replay).
+        """
+        first_wave = self.wave_manager.current_wave
+        start = time.perf_counter()
+
+        while not (stop_at_end and (self.game_over or self.game_won)):
+            if max_ticks is not None and self.sim_clock.ticks >= max_ticks:
+                break
+            if max_waves is not None and self.wave_manager.current_wave - first_wave >= max_waves:
+                break
+            self.profile_capture.begin_frame()
+            self.step()
+            self.profile_capture.end_frame()
+
+        self.profile_capture.finish()
+        self.print_summary(time.perf_counter() - start)
+
+    def print_summary(self, elapsed):
+        ticks = self.sim_clock.ticks
+        if self.game_won:
+            result = "vitória"
+        elif self.game_over:
+            result = "game over"
+        else:
+            result = "interrompido"
+
+        print(f"\n{'='*50}")
+        print("RESUMO DA SIMULAÇÃO (headless)")
+        print(f"Ticks: {ticks} ({self.sim_clock.get_ticks() / 1000:.1f}s de jogo)")
+        print(f"Tempo real: {elapsed:.2f}s ({ticks / elapsed if elapsed else 0:.0f} ticks/s)")
+        print(f"Resultado: {result}")
+        print(f"Horda: {self.wave_manager.current_wave}")
+        print(f"Inimigos derrotados: {self.enemies_killed}")
+        print(f"Nível: {self.player.level} | Integridade: {self.player.integrity}/{self.player.max_integrity}")
+        print(f"Upgrades: {len(self.player.upgrades_history)}")
+        print(f"Semente: {self.seed}")
+        print(f"Digest do estado: {self.state_digest()}")
+        print(f"{'='*50}")
+
+    def state_digest(self):
+        """
+        SHA-256 do estado da simulação. Duas execuções com a mesma semente e as
+        mesmas entradas têm que dar o mesmo digest no mesmo tick.
+        """
+        player = self.player
+        wave = self.wave_manager
+        state = (
+            self.sim_clock.ticks,
+            self.rng.getstate(),
+            tuple(player.rect), tuple(player.direction), player.status, player.frame_index,
+            player.integrity, player.max_integrity, player.vulnerable, player.hurt_time,
+            player.can_shoot, player.shoot_time, player.xp, player.level, player.xp_to_next_level,
+            player.speed, player.projectile_cooldown, player.projectile_damage,
+            tuple(player.upgrades_history),
+            wave.current_wave, wave.enemies_in_wave, wave.enemies_spawned,
+            wave.enemies_killed_this_wave, wave.wave_active, wave.wave_break, wave.break_start_time,
+            self.enemies_killed, self.game_over, self.game_won, self.game_paused,
+            self.showing_wave_tip, self.show_story, self.last_spawn_check,
+            tuple((tuple(enemy.rect), enemy.health, enemy.state, enemy.hurt_time, enemy.animation_index)
+                  for enemy in self.enemy_sprites),
+            tuple((tuple(shot.rect), tuple(shot.direction), shot.spawn_time)
+                  for shot in self.projectile_sprites),
+            tuple((tuple(data.rect), data.speed) for data in self.data_sprites),
+        )
+        return hashlib.sha256(repr(state).encode()).hexdigest()
+
+    def get_screen_state(self):
+        """Qual tela/estado está ativo neste frame"""
+        if self.game_over:
+            return 'game_over'
+        if self.game_won:
+            return 'victory'
+        if self.game_paused:
+            return 'upgrade'
+        if self.showing_wave_tip:
+            return 'wave_tip'
+        return 'playing'
+
+    def step(self):
+        """Um tick fixo da simulação: eventos, hordas/movimento e colisões"""
+        # Eventos lidos antes de avançar o relógio: um QUIT aqui encontra o
+        # estado do fim do tick anterior (é o que o replay grava)
+        events = self.input_source.events(self)
+        if RENDER_INTERPOLATION and not self.headless:
+            self.visible_sprites.save_positions()
+        self.sim_clock.advance()
+
+        for event in events:
+            self.handle_event(event)
+        self.update_spawn_timer()
+        self.profiler.lap('events')
+
+        state = self.get_screen_state()
+        if state == 'upgrade':
+            choice = self.input_source.choose_upgrade(self.upgrade_console)
+            if choice is not None:
+                self.upgrade_console.select(choice)
+                self.game_paused = False
+                # Em tempo de jogo (vale igual no replay): não atira no mesmo clique
+                self.player.hold_fire(UPGRADE_FIRE_DELAY)
+        elif state == 'playing':
+            self.update()
+            self.check_collisions()
+
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            self.profile_capture.finish()
+            pygame.quit()
+            sys.exit()
+
+        # INPUT DE GAME OVER OU VITÓRIA
+        if self.game_over or self.game_won:
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    self.reset_game()
+        
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE and not self.headless:
+                # Jogo pausado
+                self.pause()
+            elif event.key == pygame.K_F3:
+                # Overlay de desempenho por fase
+                self.profiler.toggle()
+            elif event.key == pygame.K_F4:
+                # Grava um perfil (cProfile) dos próximos frames
+                self.profile_capture.request()
+        
+        # Avançar Dica da Horda (ESPAÇO)
+        if self.showing_wave_tip and event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_SPACE:
+                self.showing_wave_tip = False
+                # Se passou da horda 10, vence o jogo
+                self.wave_manager.start_wave(self.sound_manager)
+
+    def update_spawn_timer(self):
+        # Quando o timer disparar, crie um inimigo
+        current_time = self.sim_clock.get_ticks()
+        if current_time - self.last_spawn_check < self.spawn_interval:
+            return
+        elapsed = current_time - self.last_spawn_check
+        self.last_spawn_check += elapsed - elapsed % self.spawn_interval
+
+        if not self.game_paused and not self.show_story and not self.game_over and not self.game_won and not self.showing_wave_tip:
+            self.spawn_enemy()
+
+    def update(self):
+        """Simulação de um frame de jogo (hordas, movimento, história)"""
+        should_start = self.wave_manager.update()
+        
+        # Se for para começar horda automaticamente (hordas < 5)
+        if should_start:
+            self.wave_manager.start_wave(self.sound_manager)
+        
+        # Se for para mostrar dica (horda >= 5)
+        if self.wave_manager.show_tip_trigger:
+            self.showing_wave_tip = True
+            self.wave_manager.show_tip_trigger = False
+
+
+        if self.wave_manager.current_wave > 10:
+            self.game_won = True
+            self.sound_manager.stop_music()
+            self.sound_manager.play_upgrade() 
+            print("SISTEMA SEGURO. AMEAÇA ELIMINADA.")
+        
+        self.active_sprites.update()
+        self.profiler.lap('update')
+        if self.swarm is not None:
+            # O player já se moveu: mesma ordem do update por sprite
+            view_rect = self.visible_sprites.get_view_rect(self.player, ENEMY_SIZE)
+            self.swarm.update(self.player.rect.center, self.sim_clock.get_ticks(), view_rect)
+            self.profiler.lap('swarm')
+        # ROTINA NORMAL DE JOGO
+
+        # Atualiza a grade de colisão com as novas posições
+        self.enemy_sprites.rebuild()
+        self.data_sprites.rebuild()
+
+        # Checagem de morte do player
+        if self.player.integrity <= 0:
+            self.game_over = True
+            self.sound_manager.stop_music()  # Para a música de fundo
+            self.sound_manager.play_game_over()
+            print("SISTEMA COMPROMETIDO. REINICIANDO...")
+
+        # Fim da história: libera o spawn depois da segunda mensagem começar
+        elapsed = self.sim_clock.get_ticks() - self.start_time
+        if 10000 < elapsed < 30000:
+            self.show_story = False
+
+        # Marca quando chegou a 20 inimigos (mensagem de elogio)
+        if self.enemies_killed == 20:
+            self.first_enemies_killed = self.sim_clock.get_ticks()
+
+    def check_collisions(self):
+        # --- COLISÕES ---
+        
+        # 1. Inimigo bate no Player (Dano)
+        hit_list = spritecollide(self.player, self.enemy_sprites, False)
+        if hit_list:
+            # Usa o dano específico do inimigo (com multiplicador da horda)
+            self.player.take_damage(hit_list[0].damage)
+            self.sound_manager.play_player_hurt()
             
-            elif self.showing_wave_tip:
-                # Intervalo entre hordas (Tux fala)
-                self.visible_sprites.custom_draw(self.player)
+        # 2. Tiro bate no Inimigo (Morte do Malware)
+        # groupcollide(grupo1, grupo2, kill1, kill2)
+        # kill1=True (Tiro some), kill2=True (Inimigo morre)
+        hits = groupcollide(self.projectile_sprites, self.enemy_sprites, True, False)
+        
+        for projectile, enemies_hit in hits.items():
+                for enemy in enemies_hit: 
+                    enemy.take_damage(self.player.projectile_damage)
+                    if enemy.health <= 0:
+                        # XP ao matar o inimigo
+                        DataDrop(enemy.rect.center, self.player, [self.visible_sprites, self.active_sprites, self.data_sprites])
+                        self.enemies_killed += 1
+                        self.wave_manager.enemy_killed()  # Registra morte no wave_manager
+                        self.sound_manager.play_enemy_death()
+                    else:
+                        self.sound_manager.play_hit()
+        # 3. Player coleta Data (XP)
+        collected_data = spritecollide(self.player, self.data_sprites, True)
+        for data in collected_data:
+            self.player.xp += data.value
+            # Verifica se o player subiu de nível
+            if self.player.xp >= self.player.xp_to_next_level:
+                self.player.level += 1
+                self.player.xp -= self.player.xp_to_next_level
                 
-                # Relatório de Horda
-                title_tip = f"TUX AI [RELATÓRIO HORDA {self.wave_manager.current_wave - 1}]:"
-                text_tip = self.wave_manager.tip_text + " (Pressione ESPAÇO para continuar)"
+                self.player.xp_to_next_level = int(self.player.xp_to_next_level * 1.5)
+                print(f"SYSTEM UPGRADE! Nível {self.player.level} alcançado.")
                 
-                self.dialogue_system.execute(text_tip, title_tip)
+                # Upgrade
+                self.upgrade_console.generate_options()
+                self.game_paused = True
 
-            else:
-                
-                should_start = self.wave_manager.update()
-                
-                # Se for para começar horda automaticamente (hordas < 5)
-                if should_start:
-                    self.wave_manager.start_wave(self.sound_manager)
-                
-                # Se for para mostrar dica (horda >= 5)
-                if self.wave_manager.show_tip_trigger:
-                    self.showing_wave_tip = True
-                    self.wave_manager.show_tip_trigger = False
+        # Inclui a reconstrução da grade de colisão feita no fim do update
+        self.profiler.lap('collision')
 
+    def draw(self, state, alpha=1.0):
+        """Desenha a tela do estado atual (uma vez por frame, fora dos ticks)"""
+        self.screen.fill(COLOR_BG)
 
-                if self.wave_manager.current_wave > 10:
-                    self.game_won = True
-                    self.sound_manager.stop_music()
-                    self.sound_manager.play_upgrade() 
-                    print("SISTEMA SEGURO. AMEAÇA ELIMINADA.")
-                
-                self.active_sprites.update()
-                # ROTINA NORMAL DE JOGO
+        # O jogo aparece ao fundo em todas as telas
+        self.visible_sprites.custom_draw(self.player, alpha)
+        self.profiler.lap('draw')
 
-                # Checagem de morte do player
-                if self.player.integrity <= 0:
-                    self.game_over = True
-                    self.sound_manager.stop_music()  # Para a música de fundo
-                    self.sound_manager.play_game_over()
-                    print("SISTEMA COMPROMETIDO. REINICIANDO...")
+        # LÓGICA DE VITÓRIA / DERROTA
+        if state == 'game_over':
+            self.game_over_screen.display()
+            self.profiler.lap('ui')
+        
+        elif state == 'victory':
+            # Desenha tela de vitória
+            self.victory_screen.display()
+            self.profiler.lap('ui')
+    
+        elif state == 'upgrade':
+             self.upgrade_console.display()
+             self.profiler.lap('ui')
+        
+        elif state == 'wave_tip':
+            # Intervalo entre hordas (Tux fala)
+            
+            # Relatório de Horda
+            title_tip = f"TUX AI [RELATÓRIO HORDA {self.wave_manager.current_wave - 1}]:"
+            text_tip = self.wave_manager.tip_text + " (Pressione ESPAÇO para continuar)"
+            
+            self.dialogue_system.execute(text_tip, title_tip)
 
-                # --- COLISÕES ---
-                
-                # 1. Inimigo bate no Player (Dano)
-                hit_list = pygame.sprite.spritecollide(self.player, self.enemy_sprites, False)
-                if hit_list:
-                    # Usa o dano específico do inimigo (com multiplicador da horda)
-                    self.player.take_damage(hit_list[0].damage)
-                    self.sound_manager.play_player_hurt()
-                    
-                # 2. Tiro bate no Inimigo (Morte do Malware)
-                # groupcollide(grupo1, grupo2, kill1, kill2)
-                # kill1=True (Tiro some), kill2=True (Inimigo morre)
-                hits = pygame.sprite.groupcollide(self.projectile_sprites, self.enemy_sprites, True, False)
-                
-                for projectile, enemies_hit in hits.items():
-                        for enemy in enemies_hit: 
-                            enemy.take_damage(self.player.projectile_damage)
-                            if enemy.health <= 0:
-                                # XP ao matar o inimigo
-                                DataDrop(enemy.rect.center, self.player, [self.visible_sprites, self.active_sprites, self.data_sprites])
-                                self.enemies_killed += 1
-                                self.wave_manager.enemy_killed()  # Registra morte no wave_manager
-                                self.sound_manager.play_enemy_death()
-                            else:
-                                self.sound_manager.play_hit()
-                # 3. Player coleta Data (XP)
-                collected_data = pygame.sprite.spritecollide(self.player, self.data_sprites, True)
-                for data in collected_data:
-                    self.player.xp += data.value
-                    # Verifica se o player subiu de nível
-                    if self.player.xp >= self.player.xp_to_next_level:
-                        self.player.level += 1
-                        self.player.xp -= self.player.xp_to_next_level
-                        
-                        self.player.xp_to_next_level = int(self.player.xp_to_next_level * 1.5)
-                        print(f"SYSTEM UPGRADE! Nível {self.player.level} alcançado.")
-                        
-                        # Upgrade
-                        self.upgrade_console.generate_options()
-                        self.game_paused = True
-                
-                self.visible_sprites.custom_draw(self.player)
-                self.draw_ui()
-
-                if pygame.time.get_ticks() - self.start_time < 10000:
-                     self.dialogue_system.execute(
-                         self.story_text1, 
-                         "TUX AI [ALERTA DE INTRUSÃO]:"
-                     )
-                if pygame.time.get_ticks() - self.start_time < 30000 and pygame.time.get_ticks() - self.start_time > 10000:
-                     self.dialogue_system.execute(
-                         self.story_text2, 
-                         "TUX AI [SISTEMA INICIALIZADO]:"
-                     )
-                     self.show_story = False
-                
-                 # Mensagem ao matar 20 inimigos        
-                
-                if self.enemies_killed == 20:
-                    self.first_enemies_killed = pygame.time.get_ticks()
-                
-                if pygame.time.get_ticks() - self.first_enemies_killed  < 10000 and self.enemies_killed > 20:
-                    self.dialogue_system.execute(
-                        "Excelente trabalho! Com essas ameaças controladas, nosso sistema está mais seguro. Continue assim e não hesite em usar o console de upgrades para fortalecer ainda mais nossas defesas.",
-                        "TUX AI [SISTEMA ESTÁVEL]:"
-                    )
+        else:
+            self.draw_ui()
+            self.profiler.lap('ui')
 
-            pygame.display.update()
-            self.clock.tick(FPS)
+            elapsed = self.sim_clock.get_ticks() - self.start_time
+            if elapsed < 10000:
+                 self.dialogue_system.execute(
+                     self.story_text1, 
+                     "TUX AI [ALERTA DE INTRUSÃO]:"
+                 )
+            if 10000 < elapsed < 30000:
+                 self.dialogue_system.execute(
+                     self.story_text2, 
+                     "TUX AI [SISTEMA INICIALIZADO]:"
+                 )
+            
+             # Mensagem ao matar 20 inimigos        
+            
+            if self.sim_clock.get_ticks() - self.first_enemies_killed  < 10000 and self.enemies_killed > 20:
+                self.dialogue_system.execute(
+                    "Excelente trabalho! Com essas ameaças controladas, nosso sistema está mais seguro. Continue assim e não hesite em usar o console de upgrades para fortalecer ainda mais nossas defesas.",
+                    "TUX AI [SISTEMA ESTÁVEL]:"
+                )
+
+        self.profiler.lap('dialogue')
+
+    def get_group_counts(self):
+        """Tamanho de cada grupo de sprites e contadores de som (overlay do profiler)"""
+        counts = {
+            'visíveis': len(self.visible_sprites),
+            'desenhados': self.visible_sprites.drawn_count,
+            'ativos': len(self.active_sprites),
+            'inimigos': len(self.enemy_sprites),
+            'tiros': len(self.projectile_sprites),
+            'dados': len(self.data_sprites),
+            'pool livre': len(self.projectile_pool._free),
+        }
+        if self.swarm is not None:
+            counts['enxame'] = len(self.swarm)
+        # Fila de sons (total desde o início): tocados, fundidos no mesmo frame e perdidos
+        for name, value in self.sound_manager.stats.items():
+            counts[f'sons {name}'] = value
+        return counts
 
     # main.py (Dentro da classe Game)
 
@@ -415,20 +766,22 @@ class Game:
         self.enemy_sprites.empty()
         self.projectile_sprites.empty()
         self.data_sprites.empty()
+        if self.swarm is not None:
+            self.swarm.clear()
         
         # 2. Recria o setup inicial
         self.setup_system()
         self.game_over = False
         self.game_won = False
-        self.start_time = pygame.time.get_ticks()
+        self.start_time = self.sim_clock.get_ticks()
         self.show_story = True
         self.enemies_killed = 0
-        self.upgrade_console = UpgradeConsole(self.player, self.dialogue_system, self.sound_manager)
+        self.upgrade_console = UpgradeConsole(self.player, self.dialogue_system, self.sound_manager, self.rng)
         self.pause_screen = PauseScreen(self.player)
         self.dialogue_system = DialogueSystem(self.player)
         
         # 3. Reinicia o sistema de hordas
-        self.wave_manager = WaveManager()
+        self.wave_manager = WaveManager(self.sim_clock)
         self.wave_manager.start_wave(self.sound_manager)
         
         # 4. Reinicia música de fundo
@@ -437,7 +790,8 @@ class Game:
         print("SISTEMA REINICIALIZADO.")
 
         # 5. Volta para a tela inicial
-        self.show_start_screen()
+        if self.show_menus:
+            self.show_start_screen()
 
 
     def draw_ui(self):
@@ -492,43 +846,44 @@ class Game:
         pygame.draw.rect(self.screen, (255, 255, 255), bg_rect, 1)
         
         # --- Informações da Horda ---
-        font = pygame.font.SysFont("consolas", 24)
+        font = get_font("consolas", 24)  # Resolvida uma vez só (registro de fontes)
         
         # Exibe o número da horda
-        wave_text = font.render(f"HORDA: {self.wave_manager.current_wave}", True, COLOR_TEXT)
+        wave_text = render_text(font, f"HORDA: {self.wave_manager.current_wave}", COLOR_TEXT)
         self.screen.blit(wave_text, (WIDTH - 220, 20))
         
         # Se está em intervalo, mostra contagem regressiva
         if self.wave_manager.wave_break:
             remaining_time = int(self.wave_manager.get_remaining_time())
-            countdown_text = font.render(f"Próxima horda em: {remaining_time}s", True, (255, 200, 0))
+            countdown_text = render_text(font, f"Próxima horda em: {remaining_time}s", (255, 200, 0))
             self.screen.blit(countdown_text, (WIDTH // 2 - 150, 20))
         else:
             # Mostra inimigos restantes
             remaining = self.wave_manager.get_remaining_enemies()
-            enemies_text = font.render(f"Inimigos: {remaining}/{self.wave_manager.enemies_in_wave}", True, (255, 100, 100))
+            enemies_text = render_text(font, f"Inimigos: {remaining}/{self.wave_manager.enemies_in_wave}", (255, 100, 100))
             self.screen.blit(enemies_text, (WIDTH - 220, 60))
 
     def show_start_screen(self):
         showing = True
         while showing:
             for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
+                if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                    # Quem fecha é o próximo tick (Game.handle_event), como na pausa
+                    pygame.event.post(pygame.event.Event(pygame.QUIT))
+                    showing = False
                 if event.type == pygame.KEYDOWN:
                     if event.key in (pygame.K_RETURN, pygame.K_SPACE):
                         showing = False   # Sai da tela inicial e começa o jogo
-                    elif event.key == pygame.K_ESCAPE:
-                        pygame.quit()
-                        sys.exit()
 
             # Fundo e tela inicial
             self.screen.fill(COLOR_BG)
             self.start_screen.display()
 
             pygame.display.update()
+            # Já no menu (o primeiro frame dele já está na tela)
+            self.start_music()
             self.clock.tick(30)
+        self.discard_frame_time = True
 
 
 
@@ -538,29 +893,252 @@ class CameraGroup(pygame.sprite.Group):
         super().__init__()
         self.display_surface = pygame.display.get_surface()
         self.offset = pygame.math.Vector2()
+
+        # Posições (topleft) do tick anterior, para interpolar o desenho
+        self.previous = {}
+
+        # Atlas de texturas (Game.build_atlas); None desenha as superfícies soltas
+        self.atlas = None
+
+        # Contadores do último frame (sprites desenhados x descartados fora da tela)
+        self.drawn_count = 0
+        self.culled_count = 0
         
         # Grid de fundo (efeito visual Cyberpunk)
-        self.bg_grid = pygame.Surface((2000, 2000)) # Tamanho do mapa teste
-        self.bg_grid.fill(COLOR_BG)
-        for x in range(0, 2000, TILE_SIZE):
-            pygame.draw.line(self.bg_grid, COLOR_GRID, (x, 0), (x, 2000))
-        for y in range(0, 2000, TILE_SIZE):
-            pygame.draw.line(self.bg_grid, COLOR_GRID, (0, y), (2000, y))
-
-    def custom_draw(self, player):
+        # A grade se repete a cada TILE_SIZE, então basta um padrão do tamanho
+        # da tela + 1 tile, deslocado pelo resto do offset (em vez do mapa todo)
+        pattern_w = WIDTH + TILE_SIZE
+        pattern_h = HEIGHT + TILE_SIZE
+        self.bg_pattern = pygame.Surface((pattern_w, pattern_h))
+        self.bg_pattern.fill(COLOR_BG)
+        for x in range(0, pattern_w, TILE_SIZE):
+            pygame.draw.line(self.bg_pattern, COLOR_GRID, (x, 0), (x, pattern_h))
+        for y in range(0, pattern_h, TILE_SIZE):
+            pygame.draw.line(self.bg_pattern, COLOR_GRID, (0, y), (pattern_w, y))
+
+    def get_view_rect(self, player, margin=0):
+        """Área do mundo que a câmera mostra (centrada no player), com margem"""
+        view_rect = pygame.Rect(0, 0, WIDTH + margin * 2, HEIGHT + margin * 2)
+        view_rect.center = player.rect.center
+        return view_rect
+
+    def draw_background(self):
+        """Desenha só a parte visível da grade, recortada aos limites do mapa"""
+        offset_x = int(self.offset.x)
+        offset_y = int(self.offset.y)
+
+        # Onde o mapa (MAP_SIZE x MAP_SIZE) cai na tela
+        map_rect = pygame.Rect(-offset_x, -offset_y, MAP_SIZE, MAP_SIZE)
+        visible = map_rect.clip(self.display_surface.get_rect())
+        if not visible:
+            return
+
+        previous_clip = self.display_surface.get_clip()
+        self.display_surface.set_clip(visible)
+        self.display_surface.blit(self.bg_pattern, (-(offset_x % TILE_SIZE), -(offset_y % TILE_SIZE)))
+        self.display_surface.set_clip(previous_clip)
+
+    def save_positions(self):
+        """Guarda onde cada sprite está antes do próximo tick (base da interpolação)"""
+        self.previous = {sprite: sprite.rect.topleft for sprite in self.spritedict}
+
+    def remove_internal(self, sprite):
+        # Um tiro reciclado pelo pool não pode interpolar a partir da vida anterior
+        self.previous.pop(sprite, None)
+        super().remove_internal(sprite)
+
+    def custom_draw(self, player, alpha=1.0):
+        """
+        Desenha o mundo. alpha (0..1) é quanto do tick atual já passou no tempo
+        real: com interpolação ligada, sprites e câmera são desenhados entre a
+        posição do tick anterior e a atual, então o desenho fica suave mesmo
+        com FPS de tela diferente do TICK_RATE da simulação.
+        """
+        previous = self.previous if RENDER_INTERPOLATION and alpha < 1.0 else None
+
         # Calcular o deslocamento da câmera em relação ao player
-        self.offset.x = player.rect.centerx - WIDTH // 2
-        self.offset.y = player.rect.centery - HEIGHT // 2
+        if previous is not None and player in previous:
+            prev_x, prev_y = previous[player]
+            player_x = round(prev_x + (player.rect.x - prev_x) * alpha) + player.rect.width // 2
+            player_y = round(prev_y + (player.rect.y - prev_y) * alpha) + player.rect.height // 2
+        else:
+            player_x, player_y = player.rect.center
+        self.offset.x = player_x - WIDTH // 2
+        self.offset.y = player_y - HEIGHT // 2
 
         # Desenhar o chão deslocado
-        bg_offset = (-self.offset.x, -self.offset.y)
-        self.display_surface.blit(self.bg_grid, bg_offset)
+        self.draw_background()
+
+        # Só desenha o que encosta na área visível (com folga para o tamanho do sprite)
+        view_rect = self.get_view_rect(player, CAMERA_CULL_MARGIN)
+
+        # Monta a lista (superfície, posição) do frame inteiro e manda de uma vez
+        blit_sequence = self.visible_blits(view_rect, previous, alpha)
+        if CAMERA_BATCH_BY_SURFACE:
+            blit_sequence = self.batch_by_surface(blit_sequence)
+        elif self.atlas is not None:
+            blit_sequence = self.map_to_atlas(blit_sequence)
+
+        self.submit(blit_sequence)
+
+        self.drawn_count = len(blit_sequence)
+        self.culled_count = len(self.spritedict) - self.drawn_count
+
+    def visible_blits(self, view_rect, previous=None, alpha=1.0):
+        """
+        (superfície, posição na tela) dos sprites que encostam em view_rect, na
+        ordem do grupo. Com previous (posições do tick anterior) a posição é
+        interpolada por alpha.
+        """
+        offset_x = int(self.offset.x)
+        offset_y = int(self.offset.y)
+        colliderect = view_rect.colliderect
+        if previous is None:
+            return [
+                (sprite.image, (sprite.rect.x - offset_x, sprite.rect.y - offset_y))
+                for sprite in self.spritedict
+                if colliderect(sprite.rect)
+            ]
+
+        blit_sequence = []
+        for sprite in self.spritedict:
+            rect = sprite.rect
+            if colliderect(rect):
+                start = previous.get(sprite)
+                if start is None:
+                    # Apareceu neste tick: ainda não tem de onde interpolar
+                    position = (rect.x - offset_x, rect.y - offset_y)
+                else:
+                    position = (round(start[0] + (rect.x - start[0]) * alpha) - offset_x,
+                                round(start[1] + (rect.y - start[1]) * alpha) - offset_y)
+                blit_sequence.append((sprite.image, position))
+        return blit_sequence
+
+    def batch_by_surface(self, blit_sequence):
+        """Agrupa os blits que usam a mesma superfície (na ordem da 1ª aparição)"""
+        batches = {}
+        for image, position in blit_sequence:
+            batch = batches.get(image)
+            if batch is None:
+                batches[image] = [position]
+            else:
+                batch.append(position)
+        return self.flatten_batches(batches)
+
+    def flatten_batches(self, batches):
+        """Lista de blits a partir de {superfície: [posições]}, via atlas quando houver"""
+        if self.atlas is None:
+            return [(image, position) for image, positions in batches.items() for position in positions]
+
+        # Uma consulta ao atlas por superfície distinta, não por sprite
+        region = self.atlas.region
+        blit_sequence = []
+        for image, positions in batches.items():
+            source, area = region(image)
+            if area is None:
+                blit_sequence += [(image, position) for position in positions]
+            else:
+                blit_sequence += [(source, position, area) for position in positions]
+        return blit_sequence
+
+    def map_to_atlas(self, blit_sequence):
+        """Troca (superfície, posição) por (página, posição, área) do atlas"""
+        region = self.atlas.region
+        regions = {}
+        mapped = []
+        for image, position in blit_sequence:
+            entry = regions.get(image)
+            if entry is None:
+                entry = regions[image] = region(image)
+            mapped.append((entry[0], position, entry[1]))
+        return mapped
+
+    def submit(self, blit_sequence):
+        """Envia a sequência de blits numa chamada só (fblits quando o pygame tiver)"""
+        # fblits só aceita pares (superfície, posição): com atlas há a área
+        fblits = getattr(self.display_surface, 'fblits', None) if self.atlas is None else None
+        if fblits is not None:
+            fblits(blit_sequence)
+        else:
+            self.display_surface.blits(blit_sequence, doreturn=False)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=TITLE)
+    parser.add_argument('--headless', action='store_true',
+                        help="roda a simulação sem janela, áudio nem tela inicial")
+    parser.add_argument('--ticks', type=int, default=None,
+                        help="(headless) para depois de N ticks de simulação")
+    parser.add_argument('--waves', type=int, default=None,
+                        help="(headless) para depois de N hordas concluídas")
+    parser.add_argument('--fps', type=int, default=FPS,
+                        help=f"limite de FPS do desenho, independente do TICK_RATE (0 = sem limite, padrão {FPS})")
+    parser.add_argument('--profile-frames', type=int, default=None, metavar='N',
+                        help="grava um perfil cProfile das primeiras N iterações do loop (F4 faz o mesmo no jogo)")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="semente do RNG (mesma semente + mesmas entradas = mesma partida)")
+    parser.add_argument('--record', metavar='ARQUIVO', default=None,
+                        help="grava a partida (semente + entradas por tick) para reproduzir com --replay")
+    parser.add_argument('--replay', metavar='ARQUIVO', default=None,
+                        help="reproduz uma gravação (com --headless, sem janela) e confere o estado final")
+    parser.add_argument('--startup-trace', action='store_true',
+                        help="mostra por fase onde foi o tempo de abertura do jogo")
+    return parser.parse_args(argv)
+
+
+def run_replay(args):
+    try:
+        replay = Replay.load(args.replay)
+    except (OSError, ReplayError) as error:
+        print(f"REPLAY: não foi possível abrir {args.replay}: {error}")
+        return 2
+    if replay.tick_rate != TICK_RATE:
+        print(f"REPLAY: gravado com TICK_RATE {replay.tick_rate}, o jogo usa {TICK_RATE}")
+        return 2
+
+    replay_input = ReplayInput(replay)
+    game = Game(headless=args.headless, input_source=replay_input, seed=replay.seed,
+                startup_trace=args.startup_trace)
+    if args.profile_frames:
+        game.profile_capture.request(args.profile_frames)
+    if args.headless:
+        game.run_headless(max_ticks=replay.ticks, stop_at_end=False)
+    else:
+        try:
+            game.run(render_fps=args.fps)
+        except SystemExit:
+            pass
+    if not replay_input.finished:
+        print(f"REPLAY: interrompido no tick {replay_input.tick}/{replay.ticks}")
+        return 1
+    return 0 if replay_input.report(game) else 1
 
-        # Desenhar os sprites com o deslocamento
-        for sprite in self.sprites():
-            offset_pos = sprite.rect.topleft - self.offset
-            self.display_surface.blit(sprite.image, offset_pos)
 
 if __name__ == '__main__':
-    game = Game()
-    game.run()
\ No newline at end of file
+    args = parse_args()
+    if args.replay:
+        sys.exit(run_replay(args))
+
+    if args.headless:
+        input_source = ScriptedInput()
+    else:
+        input_source = KeyboardInput()
+    if args.record:
+        seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+        input_source = RecordingInput(input_source, seed)
+        args.seed = seed
+
+    game = Game(headless=args.headless, input_source=input_source, seed=args.seed,
+                startup_trace=args.startup_trace)
+    if args.profile_frames:
+        game.profile_capture.request(args.profile_frames)
+    try:
+        if args.headless:
+            if args.ticks is None and args.waves is None:
+                args.ticks = TICK_RATE * 60 * 10  # 10 minutos de jogo
+            game.run_headless(max_ticks=args.ticks, max_waves=args.waves)
+        else:
+            game.run(render_fps=args.fps)
+    finally:
+        if args.record:
+            recording = input_source.save(args.record, game)
+            print(f"REPLAY: {recording.ticks} ticks gravados em {args.record}")
\ No newline at end of file
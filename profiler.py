@@ -0,0 +1,294 @@
+import cProfile
+import os
+import pstats
+import time
+from array import array
+from time import perf_counter_ns
+
+import pygame
+from settings import *
+from fonts import get_font
+
+# Fases do frame, na ordem em que acontecem no Game.run
+PHASES = ("events", "update", "swarm", "collision", "draw", "ui", "dialogue", "present")
+
+
+class FrameProfiler:
+    """
+    Cronômetro por fase do frame, com histórico em ring buffers (ns).
+
+    O Game chama begin_frame() no início do frame, lap(fase) ao fim de cada
+    fase (o tempo desde a marca anterior vai para a fase; várias passagens no
+    mesmo frame, como vários ticks, somam) e end_frame() no fim. Desligado,
+    cada chamada só testa uma flag e retorna.
+
+    toggle() (F3) liga/desliga; a mudança vale a partir do próximo frame, para
+    nunca registrar um frame pela metade.
+    """
+
+    def __init__(self, phases=PHASES, history=PROFILER_HISTORY):
+        self.phases = phases
+        self.history = history
+        self.enabled = False
+        self.visible = False
+
+        self.samples = {phase: array('q', bytes(8 * history)) for phase in phases}
+        self.frame_times = array('q', bytes(8 * history))  # frame inteiro (inclui a espera do FPS)
+        self.work_times = array('q', bytes(8 * history))   # soma das fases
+        self.index = 0
+        self.count = 0
+
+        self._current = dict.fromkeys(phases, 0)
+        self._frame_start = 0
+        self._last = 0
+
+        # Painel do overlay (refeito a cada PROFILER_REFRESH_MS)
+        self.font = None
+        self._panel = None
+        self._panel_time = 0
+
+    # ---------------- MEDIÇÃO -----------------
+
+    def toggle(self):
+        self.visible = not self.visible
+
+    def begin_frame(self):
+        now = perf_counter_ns()
+        if self.enabled:
+            self.frame_times[self.index] = now - self._frame_start
+        elif self.visible:
+            self.reset()
+
+        self.enabled = self.visible
+        self._frame_start = self._last = now
+
+    def lap(self, phase):
+        if not self.enabled:
+            return
+        now = perf_counter_ns()
+        self._current[phase] += now - self._last
+        self._last = now
+
+    def end_frame(self):
+        """Fecha o frame: grava as fases nos ring buffers"""
+        if not self.enabled:
+            return
+        index = self.index
+        current = self._current
+        for phase in self.phases:
+            self.samples[phase][index] = current[phase]
+            current[phase] = 0
+        self.work_times[index] = self._last - self._frame_start
+
+        # frame_times[index] é preenchido no begin_frame seguinte
+        self.index = (index + 1) % self.history
+        self.count = min(self.count + 1, self.history)
+
+    def last_frame(self):
+        """Tempo (ns) de cada fase no último frame fechado"""
+        index = (self.index - 1) % self.history
+        return {phase: self.samples[phase][index] for phase in self.phases}
+
+    def reset(self):
+        self.index = 0
+        self.count = 0
+        self._current = dict.fromkeys(self.phases, 0)
+        self._panel = None
+
+    # ---------------- ESTATÍSTICAS -----------------
+
+    def _recent(self, buffer, skip_last=False):
+        """Amostras válidas do buffer, da mais antiga para a mais nova"""
+        count = self.count - 1 if skip_last else self.count
+        if count <= 0:
+            return []
+        end = self.index - 1 if skip_last else self.index
+        return [buffer[(end - count + i) % self.history] for i in range(count)]
+
+    def mean_ms(self, phase):
+        values = self._recent(self.samples[phase])
+        return sum(values) / len(values) / 1e6 if values else 0.0
+
+    def mean_ms_work(self):
+        values = self._recent(self.work_times)
+        return sum(values) / len(values) / 1e6 if values else 0.0
+
+    def fps(self):
+        # frame_times do último frame gravado ainda não foi fechado
+        values = self._recent(self.frame_times, skip_last=True)
+        return len(values) * 1e9 / sum(values) if values and sum(values) else 0.0
+
+    # ---------------- OVERLAY -----------------
+
+    def draw(self, surface, counts):
+        """Desenha o overlay (F3): ms por fase, FPS, gráfico do frame e contagens"""
+        if not self.enabled:
+            return
+
+        now = pygame.time.get_ticks()
+        if self._panel is None or now - self._panel_time >= PROFILER_REFRESH_MS:
+            self._panel = self.build_panel(counts)
+            self._panel_time = now
+
+        # Abaixo das barras do HUD (a caixa de diálogo ocupa a parte de baixo)
+        surface.blit(self._panel, (20, 75))
+
+    def build_panel(self, counts):
+        if self.font is None:
+            self.font = get_font("consolas", 14)
+        font = self.font
+        line_height = font.get_linesize()
+        graph_height = 60
+
+        lines = [f"FPS {self.fps():5.1f}   trabalho {self.mean_ms_work():6.2f} ms"]
+        lines += [f"{phase:<10}{self.mean_ms(phase):7.3f} ms" for phase in self.phases]
+        lines.append("")
+        lines += [f"{name:<14}{count:>6}" for name, count in counts.items()]
+
+        width = 260
+        height = 10 + line_height * len(lines) + graph_height + 15
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 190))
+        pygame.draw.rect(panel, (0, 255, 0), panel.get_rect(), 1)
+
+        # Texto muda a cada atualização: render direto, sem passar pelo cache de textos
+        y = 5
+        for line in lines:
+            panel.blit(font.render(line, True, (0, 255, 0)), (8, y))
+            y += line_height
+
+        # Gráfico do tempo de trabalho por frame (linha amarela = orçamento de 1 frame)
+        graph = pygame.Rect(8, y + 5, width - 16, graph_height)
+        pygame.draw.rect(panel, (40, 40, 60), graph, 1)
+        budget_ms = 1000 / FPS
+        scale = graph_height / (budget_ms * 2)
+        budget_y = graph.bottom - int(budget_ms * scale)
+        pygame.draw.line(panel, (255, 200, 0), (graph.left, budget_y), (graph.right - 1, budget_y))
+
+        values = self._recent(self.work_times)[-graph.width:]
+        x = graph.right - len(values)
+        for value in values:
+            bar = min(graph_height, int(value / 1e6 * scale))
+            color = (0, 255, 0) if value / 1e6 <= budget_ms else (255, 60, 60)
+            pygame.draw.line(panel, color, (x, graph.bottom - 1), (x, graph.bottom - bar))
+            x += 1
+        return panel
+
+
+class ProfileCapture:
+    """
+    Captura sob demanda com cProfile das próximas N iterações do loop do jogo.
+
+    request(n) arma a captura (F4 ou --profile-frames); o Game chama
+    begin_frame()/end_frame() em volta de cada iteração, e o perfil só fica
+    ligado dentro delas (a espera do limitador de FPS fica de fora). Ao fim,
+    grava em PROFILE_DIR um .prof (abre com pstats/snakeviz) e um .txt com as
+    PROFILE_TOP funções de maior tempo acumulado.
+    """
+
+    def __init__(self, directory=None, top=PROFILE_TOP):
+        self.directory = directory or os.path.join(os.path.dirname(os.path.abspath(__file__)), PROFILE_DIR)
+        self.top = top
+        self.profile = None
+        self.pending = 0
+        self.remaining = 0
+        self.frames = 0
+        self._start = 0.0
+        self.last_paths = None
+
+    @property
+    def active(self):
+        return self.profile is not None
+
+    def request(self, frames=PROFILE_CAPTURE_FRAMES):
+        """Arma uma captura (ignorado se já houver uma em andamento)"""
+        if self.active or self.pending:
+            return False
+        self.pending = frames
+        print(f"PROFILER: capturando os próximos {frames} frames...")
+        return True
+
+    def begin_frame(self):
+        if self.pending:
+            self.profile = cProfile.Profile()
+            self.remaining = self.frames = self.pending
+            self.pending = 0
+            self._start = time.perf_counter()
+        if self.profile is not None:
+            self.profile.enable()
+
+    def end_frame(self):
+        if self.profile is None:
+            return
+        self.profile.disable()
+        self.remaining -= 1
+        if self.remaining <= 0:
+            self.save()
+
+    def finish(self):
+        """Salva o que já foi capturado (jogo fechado no meio da captura)"""
+        self.pending = 0
+        if self.profile is not None:
+            self.frames -= self.remaining
+            return self.save()
+
+    def save(self):
+        profile, self.profile = self.profile, None
+        elapsed = time.perf_counter() - self._start
+
+        os.makedirs(self.directory, exist_ok=True)
+        # Duas capturas no mesmo segundo (--profile-frames curto e F4, por
+        # exemplo) ganham sufixo -1, -2...: o "x" reserva o nome sem sobrescrever
+        stamp = time.strftime("profile_%Y%m%d-%H%M%S")
+        suffix = 0
+        while True:
+            base = os.path.join(self.directory, f"{stamp}-{suffix}" if suffix else stamp)
+            prof_path = base + ".prof"
+            text_path = base + ".txt"
+            if not os.path.exists(prof_path):
+                try:
+                    file = open(text_path, "x", encoding="utf-8")
+                    break
+                except FileExistsError:
+                    pass
+            suffix += 1
+
+        profile.dump_stats(prof_path)
+        with file:
+            file.write(f"{self.frames} frames capturados em {elapsed:.2f}s\n")
+            file.write(f"Top {self.top} por tempo acumulado\n\n")
+            stats = pstats.Stats(profile, stream=file)
+            stats.sort_stats("cumulative").print_stats(self.top)
+
+        self.last_paths = (prof_path, text_path)
+        print(f"PROFILER: perfil salvo em {prof_path} (resumo em {text_path})")
+        return self.last_paths
+
+
+class StartupTrace:
+    """
+    Marcos da inicialização para o --startup-trace: mark(rótulo) fecha a fase
+    que terminou agora (desde o marco anterior) e report() imprime a tabela.
+    """
+
+    def __init__(self, start=None, enabled=True):
+        self.enabled = enabled
+        self.start = start if start is not None else time.perf_counter()
+        self._last = self.start
+        self.phases = []
+
+    def mark(self, label):
+        now = time.perf_counter()
+        if self.enabled:
+            self.phases.append((label, now - self._last))
+        self._last = now
+
+    def report(self):
+        if not self.enabled:
+            return
+        total = self._last - self.start
+        print("INICIALIZAÇÃO (--startup-trace):")
+        for label, seconds in self.phases:
+            share = seconds / total * 100 if total else 0
+            print(f"  {label:<32} {seconds * 1000:8.1f} ms  {share:5.1f}%")
+        print(f"  {'total':<32} {total * 1000:8.1f} ms")
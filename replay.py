@@ -0,0 +1,278 @@
+import pygame
+from settings import TICK_RATE
+from inputs import KeyState
+
+# Gravação e reprodução de partidas.
+#
+# Como a simulação é determinística (passo fixo + RNG com semente), basta
+# guardar a semente e, por tick, o que a fonte de entrada entregou ao jogo:
+# teclas de movimento seguradas, ESPAÇO/ESC apertados e upgrades escolhidos.
+#
+# Formato binário (inteiros em varint LEB128):
+#   cabeçalho: MAGIC, versão, semente (zigzag), TICK_RATE, total de ticks,
+#              digest SHA-256 do estado final (32 bytes)
+#   registros: só para ticks em que algo mudou
+#       varint  ticks desde o registro anterior
+#       byte    flags (REC_KEYS | REC_EVENTS | REC_UPGRADE)
+#       [byte]  máscara das teclas seguradas          (REC_KEYS)
+#       [varint n + n bytes] códigos de EVENT_KEYS     (REC_EVENTS)
+#       [varint] índice do upgrade escolhido           (REC_UPGRADE)
+
+MAGIC = b"RAPZ"
+VERSION = 1
+
+# Teclas que Player.input lê, na ordem dos bits da máscara
+MOVEMENT_KEYS = (
+    pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d,
+    pygame.K_UP, pygame.K_LEFT, pygame.K_DOWN, pygame.K_RIGHT,
+)
+# Teclas de evento gravadas (índice = código no arquivo)
+EVENT_KEYS = (pygame.K_SPACE, pygame.K_ESCAPE)
+
+REC_KEYS = 1
+REC_EVENTS = 2
+REC_UPGRADE = 4
+
+
+class ReplayError(Exception):
+    """Arquivo de replay inválido ou de outra versão"""
+
+
+def write_varint(buffer, value):
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            buffer.append(byte | 0x80)
+        else:
+            buffer.append(byte)
+            return
+
+
+def read_varint(data, pos):
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ReplayError("replay truncado")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+
+def zigzag(value):
+    # Inteiros com sinal (--seed -1) viram não negativos: 0, -1, 1, -2... -> 0, 1, 2, 3...
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def unzigzag(value):
+    return value // 2 if value % 2 == 0 else -(value + 1) // 2
+
+
+def keys_to_mask(keys):
+    mask = 0
+    for bit, key in enumerate(MOVEMENT_KEYS):
+        if keys[key]:
+            mask |= 1 << bit
+    return mask
+
+
+def mask_to_keys(mask):
+    return KeyState(key for bit, key in enumerate(MOVEMENT_KEYS) if mask & (1 << bit))
+
+
+class Replay:
+    """Conteúdo de um replay: semente, ticks e a entrada de cada tick"""
+
+    def __init__(self, seed, tick_rate=TICK_RATE, ticks=0, digest=bytes(32)):
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.ticks = ticks
+        self.digest = digest
+        # tick -> [máscara ou None, eventos, upgrade ou None]
+        self.frames = {}
+
+    def frame(self, tick):
+        return self.frames.setdefault(tick, [None, [], None])
+
+    def to_bytes(self):
+        data = bytearray(MAGIC)
+        for value in (VERSION, zigzag(self.seed), self.tick_rate, self.ticks):
+            write_varint(data, value)
+        data += self.digest
+
+        last_tick = 0
+        for tick in sorted(self.frames):
+            mask, events, upgrade = self.frames[tick]
+            flags = (REC_KEYS if mask is not None else 0) | (REC_EVENTS if events else 0) | (REC_UPGRADE if upgrade is not None else 0)
+            if not flags:
+                continue
+            write_varint(data, tick - last_tick)
+            data.append(flags)
+            if mask is not None:
+                data.append(mask)
+            if events:
+                write_varint(data, len(events))
+                data += bytes(EVENT_KEYS.index(key) for key in events)
+            if upgrade is not None:
+                write_varint(data, upgrade)
+            last_tick = tick
+        return bytes(data)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if data[:len(MAGIC)] != MAGIC:
+            raise ReplayError("não é um arquivo de replay")
+        pos = len(MAGIC)
+        version, pos = read_varint(data, pos)
+        if version != VERSION:
+            raise ReplayError(f"versão de replay {version} não suportada")
+        seed, pos = read_varint(data, pos)
+        seed = unzigzag(seed)
+        tick_rate, pos = read_varint(data, pos)
+        ticks, pos = read_varint(data, pos)
+        digest = bytes(data[pos:pos + 32])
+        pos += 32
+
+        replay = cls(seed, tick_rate, ticks, digest)
+        tick = 0
+        while pos < len(data):
+            delta, pos = read_varint(data, pos)
+            tick += delta
+            flags = data[pos]
+            pos += 1
+            frame = replay.frame(tick)
+            if flags & REC_KEYS:
+                frame[0] = data[pos]
+                pos += 1
+            if flags & REC_EVENTS:
+                count, pos = read_varint(data, pos)
+                frame[1] = [EVENT_KEYS[code] for code in data[pos:pos + count]]
+                pos += count
+            if flags & REC_UPGRADE:
+                frame[2], pos = read_varint(data, pos)
+        return replay
+
+    def save(self, path):
+        with open(path, "wb") as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as file:
+            return cls.from_bytes(file.read())
+
+
+class RecordingInput:
+    """
+    Envolve outra fonte de entrada e grava, tick a tick, o que ela entregou.
+    O jogo recebe as teclas já filtradas pela máscara, então a partida gravada
+    é exatamente a que a reprodução vai ver.
+
+    O replay termina no último tick completo: no QUIT (lido antes do relógio
+    andar) ou quando save() é chamado com o jogo parado entre ticks.
+    """
+
+    def __init__(self, source, seed):
+        self.source = source
+        self.interactive = source.interactive
+        self.replay = Replay(seed)
+        self.tick = 0
+        self.last_mask = 0
+        self.closed = False
+
+    def get_pressed(self):
+        mask = keys_to_mask(self.source.get_pressed())
+        if mask != self.last_mask:
+            self.replay.frame(self.tick)[0] = mask
+            self.last_mask = mask
+        return mask_to_keys(mask)
+
+    def events(self, game):
+        events = self.source.events(game)
+        if any(event.type == pygame.QUIT for event in events):
+            self.close(game)
+            return events
+
+        # Cada chamada corresponde a um tick (Game.step)
+        self.tick += 1
+        for event in events:
+            if event.type == pygame.KEYDOWN and event.key in EVENT_KEYS:
+                self.replay.frame(self.tick)[1].append(event.key)
+        return events
+
+    def choose_upgrade(self, console):
+        index = self.source.choose_upgrade(console)
+        if index is not None:
+            self.replay.frame(self.tick)[2] = index
+        return index
+
+    def close(self, game):
+        """Fecha a gravação com o total de ticks e o digest do estado atual"""
+        if not self.closed:
+            self.replay.ticks = self.tick
+            self.replay.digest = bytes.fromhex(game.state_digest())
+            self.closed = True
+
+    def save(self, path, game):
+        self.close(game)
+        self.replay.save(path)
+        return self.replay
+
+
+class ReplayInput:
+    """
+    Fonte de entrada que reproduz um Replay. ESC (pausa) fica de fora: pausar
+    não muda a simulação. Da fila real do pygame só passam QUIT e F3/F4, para
+    dar para fechar e medir o replay com janela.
+    """
+
+    interactive = False
+
+    def __init__(self, replay):
+        self.replay = replay
+        self.tick = 0
+        self.mask = 0
+        self.verified = None
+
+    @property
+    def finished(self):
+        return self.tick >= self.replay.ticks
+
+    def get_pressed(self):
+        return mask_to_keys(self.mask)
+
+    def events(self, game):
+        events = [event for event in pygame.event.get()
+                  if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key in (pygame.K_F3, pygame.K_F4))]
+        if self.finished:
+            # Fim da gravação: confere o estado e fecha o jogo (modo com janela)
+            self.report(game)
+            return [pygame.event.Event(pygame.QUIT)]
+
+        self.tick += 1
+        frame = self.replay.frames.get(self.tick)
+        if frame is None:
+            return events
+        if frame[0] is not None:
+            self.mask = frame[0]
+        events += [pygame.event.Event(pygame.KEYDOWN, key=key) for key in frame[1] if key != pygame.K_ESCAPE]
+        return events
+
+    def choose_upgrade(self, console):
+        frame = self.replay.frames.get(self.tick)
+        return frame[2] if frame is not None else None
+
+    def verify(self, game):
+        """True se o estado atual do jogo bate com o digest gravado"""
+        return bytes.fromhex(game.state_digest()) == self.replay.digest
+
+    def report(self, game):
+        if self.verified is None:
+            self.verified = self.verify(game)
+            result = "idêntico à gravação" if self.verified else "DIVERGIU da gravação"
+            print(f"REPLAY: {self.tick}/{self.replay.ticks} ticks, estado final {result}")
+        return self.verified
@@ -1,11 +1,28 @@
 # Configurações da Janela
 WIDTH = 1280
 HEIGHT = 720
-FPS = 60
+FPS = 60  # Limite padrão de FPS do desenho (--fps muda)
+TICK_RATE = 60  # Passos fixos de simulação por segundo
+MAX_FRAME_STEPS = 5  # Máximo de passos por frame (se atrasar mais, o resto é descartado)
+RENDER_INTERPOLATION = True  # Desenha entre o tick anterior e o atual (suave com FPS != TICK_RATE)
 TITLE = "Root Access: Protocolo Zero"
 
 # Configurações do Jogo
 TILE_SIZE = 32  # Tamanho base para o pixel art (depois escalamos)
+MAP_SIZE = 2000  # Lado do mapa quadrado (em pixels)
+SPATIAL_CELL_SIZE = 128  # Lado de cada célula da grade de colisão
+SPATIAL_LINEAR_SCAN = 8  # Abaixo disso a busca de vizinhos varre o grupo inteiro
+CAMERA_CULL_MARGIN = 32  # Folga (px) além da tela antes de descartar um sprite no desenho
+CAMERA_BATCH_BY_SURFACE = True  # Agrupa os blits por superfície (muda a ordem de sobreposição)
+TEXTURE_ATLAS = True  # Desenha os sprites a partir de regiões de um atlas (atlas.py)
+ATLAS_PAGE_SIZE = 1024  # Lado de cada página do atlas de texturas
+TEXT_CACHE_SIZE = 256  # Máximo de textos renderizados guardados no cache (LRU)
+DIALOGUE_CACHE_SIZE = 8  # Caixas de diálogo já compostas guardadas (LRU)
+PROFILER_HISTORY = 240  # Frames guardados pelo profiler (F3)
+PROFILER_REFRESH_MS = 250  # Intervalo de atualização do overlay do profiler
+PROFILE_CAPTURE_FRAMES = 300  # Frames gravados pelo cProfile ao apertar F4
+PROFILE_TOP = 40  # Funções listadas no resumo em texto do cProfile
+PROFILE_DIR = "profiles"  # Pasta (dentro do jogo) onde os perfis são salvos
 
 # Paleta de Cores (Cyberpunk Theme)
 COLOR_BG = (10, 10, 20)        # Azul muito escuro (fundo do terminal)
@@ -26,6 +43,7 @@ ENEMY_SIZE = 62       # Um pouco menor que o player
 ENEMY_DAMAGE = 10     # Dano causado ao player por colisão
 ENEMY_HEALTH = 50     # Vida do inimigo
 SPAWN_RATE = 500      # Milissegundos entre cada spawn (quanto menor, mais difícil)
+USE_SWARM_ENGINE = True  # Move os inimigos com NumPy (se instalado)
 
 #Stats do Tiro
 PROJECTILE_SIZE = 10
@@ -33,8 +51,11 @@ PROJECTILE_SPEED = 10
 PROJECTILE_LIFETIME = 1000 # Milissegundos que o tiro dura antes de sumir
 PROJECTILE_DAMAGE = 25
 WEAPON_COOLDOWN = 600      # Cadência de tiro (ms) - Quanto menor, mais rápido
+UPGRADE_FIRE_DELAY = 200   # Tiro segurado (ms de jogo) ao sair do menu de upgrade
 COLOR_PROJECTILE = (255, 255, 0) # Amarelo 
 PROJECTILE_SIZE = 78
+PROJECTILE_POOL_SIZE = 256 # Máximo de tiros guardados para reutilização
+PROJECTILE_ROTATION_STEPS = 64 # Resolução angular da tabela de rotações do tiro
 
 # Configurações de XP (Data)
 COLOR_XP = (170, 255, 0) # Verde brilhante
@@ -51,4 +72,11 @@ WAVE_DIFFICULTY_MULTIPLIER = 1.15  # Multiplicador de dificuldade por horda
 # Escalamento de dificuldade dos inimigos por horda
 WAVE_HEALTH_MULTIPLIER = 1.2    # Aumento de vida por horda
 WAVE_SPEED_MULTIPLIER = 1.08    # Aumento de velocidade por horda
-WAVE_DAMAGE_MULTIPLIER = 1.1    # Aumento de dano por horda
\ No newline at end of file
+WAVE_DAMAGE_MULTIPLIER = 1.1    # Aumento de dano por horda
+
+# Áudio
+SOUND_CHANNELS = 16             # Canais do mixer (cada efeito reserva os seus, ver sound_manager.SOUNDS)
+
+# Assets
+FONT_CACHE = ".font_cache.json"  # Nome da fonte -> arquivo, resolvido uma vez e guardado entre execuções
+ASSET_PACK = "assets.pack"      # Pacote gerado com frames escalados e sons em PCM (python asset_pack.py)
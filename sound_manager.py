@@ -1,39 +1,104 @@
 import pygame
 import os
+import time
+from settings import SOUND_CHANNELS
+
+# PCM vindo do pacote de assets pelo AssetLoader: caminho -> (formato do mixer, buffer).
+# Usado uma vez, quando o mixer abre no mesmo formato.
+preloaded_sounds = {}
+
+# Efeitos sonoros: nome -> (arquivo, volume padrão, quantos podem tocar juntos).
+# Cada efeito tem seus próprios canais reservados no mixer (na ordem abaixo),
+# então uma chuva de tiros nunca rouba o canal do game over ou da horda.
+SOUNDS = {
+    'shoot': ('assets/sounds/shoot.wav', 0.2, 3),
+    'hit': ('assets/sounds/hit.wav', 0.4, 2),
+    'enemy_death': ('assets/sounds/enemy_death.wav', 0.4, 3),
+    'player_hurt': ('assets/sounds/player_hurt.wav', 0.5, 1),
+    'wave_start': ('assets/sounds/wave_start.wav', 0.6, 1),
+    'upgrade': ('assets/sounds/upgrade.wav', 0.5, 1),
+    'game_over': ('assets/sounds/game_over.wav', 2.0, 1),
+}
+
 
 class SoundManager:
-    """Gerenciador centralizado de sons do jogo"""
-    
-    def __init__(self):
-        pygame.mixer.init()
-        
-        # Carrega todos os sons
-        self.shoot_sound = self.load_sound('assets/sounds/shoot.wav')
-        self.wave_start_sound = self.load_sound('assets/sounds/wave_start.wav')
-        self.upgrade_sound = self.load_sound('assets/sounds/upgrade.wav')
-        self.hit_sound = self.load_sound('assets/sounds/hit.wav')
-        self.enemy_death_sound = self.load_sound('assets/sounds/enemy_death.wav')
-        self.player_hurt_sound = self.load_sound('assets/sounds/player_hurt.wav')
-        self.game_over_sound = self.load_sound('assets/sounds/game_over.wav')
+    """
+    Gerenciador centralizado de sons do jogo.
+
+    Os play_* não tocam na hora: só enfileiram o pedido. Uma vez por frame o
+    Game chama flush(), que junta os pedidos do mesmo som numa reprodução só
+    (volume cresce com a raiz da quantidade) e toca num canal livre daquele
+    som. Sem canal livre, o pedido é perdido. Os contadores ficam em stats.
+
+    O mixer só abre no primeiro som (ou música) de verdade, não na criação:
+    abrir o dispositivo de áudio fica fora do caminho até a primeira tela.
+    """
+
+    def __init__(self, on_audio_ready=None):
+        # None = mixer ainda fechado; False = sem áudio nesta máquina
+        self.audio_ready = None
+        self.init_time = None
+        # Chamado com o SoundManager quando o mixer abre (o Game atualiza o pacote)
+        self.on_audio_ready = on_audio_ready
+        self.sounds = {}
+        # Sons decodificados do WAV na abertura (sem PCM do pacote nesse formato)
+        self.decoded = []
+        self.channels = {}
+
+        # Fila do frame: nome -> [pedidos, maior volume pedido]
+        self.queue = {}
+        self.stats = {'tocados': 0, 'fundidos': 0, 'perdidos': 0}
         
-        # Música de fundo
+        # Música de fundo (carregada junto com o mixer)
         self.background_music_path = 'assets/sounds/soundtrack.wav'
-        if os.path.exists(self.background_music_path):
-            pygame.mixer.music.load(self.background_music_path)
-            pygame.mixer.music.set_volume(0.3)
-        else:
+        if not os.path.exists(self.background_music_path):
             # Tenta no diretório raiz
             alt_path = 'soundtrack.wav'
             if os.path.exists(alt_path):
                 self.background_music_path = alt_path
-                pygame.mixer.music.load(self.background_music_path)
-                pygame.mixer.music.set_volume(0.3)
+
+    def init_audio(self):
+        """Abre o mixer e carrega os sons na primeira vez; False se não houver áudio"""
+        if self.audio_ready is not None:
+            return self.audio_ready
+
+        start = time.perf_counter()
+        try:
+            pygame.mixer.init()
+        except pygame.error as e:
+            print(f"Aviso: áudio indisponível: {e}")
+            self.audio_ready = False
+            return False
+        pygame.mixer.set_num_channels(max(SOUND_CHANNELS, sum(limit for _, _, limit in SOUNDS.values())))
+
+        # Carrega todos os sons e reserva os canais de cada um
+        next_channel = 0
+        for name, (path, _, limit) in SOUNDS.items():
+            self.sounds[name] = self.load_sound(path)
+            self.channels[name] = [pygame.mixer.Channel(i) for i in range(next_channel, next_channel + limit)]
+            next_channel += limit
+        # Sound.play() sem canal (se alguém chamar) não pega os reservados
+        pygame.mixer.set_reserved(next_channel)
+
+        if os.path.exists(self.background_music_path):
+            pygame.mixer.music.load(self.background_music_path)
+            pygame.mixer.music.set_volume(0.3)
+
+        self.init_time = time.perf_counter() - start
+        self.audio_ready = True
+        if self.on_audio_ready is not None:
+            self.on_audio_ready(self)
+        return True
     
     def load_sound(self, path):
         """Carrega um som, retorna som vazio se não encontrar"""
+        pcm = preloaded_sounds.pop(path, None)
+        if pcm is not None and pcm[0] == pygame.mixer.get_init():
+            return pygame.mixer.Sound(buffer=pcm[1])
         try:
             if os.path.exists(path):
                 sound = pygame.mixer.Sound(path)
+                self.decoded.append(path)
                 return sound
             else:
                 # Retorna som silencioso se arquivo não existir
@@ -41,51 +106,120 @@ class SoundManager:
         except Exception as e:
             print(f"Aviso: Não foi possível carregar {path}: {e}")
             return pygame.mixer.Sound(buffer=bytes(32))
+
+    def request(self, name, volume=None):
+        """Enfileira um som para o próximo flush()"""
+        if volume is None:
+            volume = SOUNDS[name][1]
+        entry = self.queue.get(name)
+        if entry is None:
+            self.queue[name] = [1, volume]
+        else:
+            entry[0] += 1
+            entry[1] = max(entry[1], volume)
+
+    def flush(self):
+        """Toca os sons enfileirados no frame (um por tipo) e esvazia a fila"""
+        if not self.queue:
+            return
+        stats = self.stats
+        if not self.init_audio():
+            stats['perdidos'] += sum(count for count, _ in self.queue.values())
+            self.queue.clear()
+            return
+        for name, (count, volume) in self.queue.items():
+            stats['fundidos'] += count - 1
+            channel = next((channel for channel in self.channels[name] if not channel.get_busy()), None)
+            if channel is None:
+                stats['perdidos'] += count
+                continue
+            # Volume no canal (o Sound compartilhado não é alterado), antes do
+            # play: senão o primeiro trecho pode sair no volume anterior do canal
+            channel.set_volume(min(1.0, volume * count ** 0.5))
+            channel.play(self.sounds[name])
+            stats['tocados'] += 1
+        self.queue.clear()
     
     def play_shoot(self, volume=0.2):
         """Som de tiro do jogador"""
-        self.shoot_sound.set_volume(volume)
-        self.shoot_sound.play()
+        self.request('shoot', volume)
     
     def play_wave_start(self, volume=0.6):
         """Som de início de horda"""
-        self.wave_start_sound.set_volume(volume)
-        self.wave_start_sound.play()
+        self.request('wave_start', volume)
     
     def play_upgrade(self, volume=0.5):
         """Som de upgrade disponível"""
-        self.upgrade_sound.set_volume(volume)
-        self.upgrade_sound.play()
+        self.request('upgrade', volume)
     
     def play_hit(self, volume=0.4):
         """Som de inimigo levando dano"""
-        self.hit_sound.set_volume(volume)
-        self.hit_sound.play()
+        self.request('hit', volume)
     
     def play_enemy_death(self, volume=0.4):
         """Som de inimigo morrendo"""
-        self.enemy_death_sound.set_volume(volume)
-        self.enemy_death_sound.play()
+        self.request('enemy_death', volume)
     
     def play_player_hurt(self, volume=0.5):
         """Som de jogador levando dano"""
-        self.player_hurt_sound.set_volume(volume)
-        self.player_hurt_sound.play()
+        self.request('player_hurt', volume)
     
     def play_game_over(self, volume=2.0):
         """Som de game over (jogador morreu)"""
-        self.game_over_sound.set_volume(volume)
-        self.game_over_sound.play()
+        self.request('game_over', volume)
     
     def play_music(self, loop=-1):
         """Toca música de fundo (loop=-1 para repetir infinitamente)"""
-        if os.path.exists(self.background_music_path):
+        if os.path.exists(self.background_music_path) and self.init_audio():
             pygame.mixer.music.play(loop)
     
     def stop_music(self):
         """Para a música de fundo"""
-        pygame.mixer.music.stop()
+        if self.audio_ready:
+            pygame.mixer.music.stop()
     
     def set_music_volume(self, volume):
         """Ajusta volume da música (0.0 a 1.0)"""
-        pygame.mixer.music.set_volume(volume)
+        if self.audio_ready:
+            pygame.mixer.music.set_volume(volume)
+
+
+class NullSoundManager:
+    """Mesma interface do SoundManager, sem mixer nem arquivos (modo headless)"""
+
+    def __init__(self):
+        self.stats = {'tocados': 0, 'fundidos': 0, 'perdidos': 0}
+        self.init_time = None
+
+    def flush(self):
+        pass
+
+    def play_shoot(self, volume=0.2):
+        pass
+
+    def play_wave_start(self, volume=0.6):
+        pass
+
+    def play_upgrade(self, volume=0.5):
+        pass
+
+    def play_hit(self, volume=0.4):
+        pass
+
+    def play_enemy_death(self, volume=0.4):
+        pass
+
+    def play_player_hurt(self, volume=0.5):
+        pass
+
+    def play_game_over(self, volume=2.0):
+        pass
+
+    def play_music(self, loop=-1):
+        pass
+
+    def stop_music(self):
+        pass
+
+    def set_music_volume(self, volume):
+        pass
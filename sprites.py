@@ -4,6 +4,11 @@ import math
 import os
 import random
 from settings import *
+from asset_cache import frame_cache, asset_path
+from groups import SpatialGroup
+from swarm import SwarmField
+from timing import real_clock
+from inputs import KeyboardInput
 
 # Simples: só carregamos a imagem principal da horda `anonymus.png`.
 # Procuramos em `assets/enemies/anonymus.png` primeiro, depois no root.
@@ -52,16 +57,16 @@ def list_enemy_images():
     return ENEMY_IMAGE_SOURCES.copy()
 
 class Player(pygame.sprite.Sprite):
-    def __init__(self, pos, groups, enemy_sprites, create_projectile_func, sound_manager=None):
+    def __init__(self, pos, groups, enemy_sprites, create_projectile_func, sound_manager=None, input_source=None, clock=None):
         super().__init__(groups)
 
+        # Relógio do jogo (cooldowns e invencibilidade)
+        self.clock = clock if clock is not None else real_clock
+
         # --------- IMAGEM DO TUX PARA A UI (base_image) ----------
-        base_dir = os.path.dirname(__file__)
         try:
             # se o teu arquivo estiver em assets/tux.webp, usa essa linha:
-            tux_path = os.path.join(base_dir, "assets", "tux.webp")
-            tux_loaded = pygame.image.load(tux_path).convert_alpha()
-            self.base_image = pygame.transform.scale(tux_loaded, (TILE_SIZE, TILE_SIZE))
+            self.base_image = frame_cache.get_image(asset_path("tux.webp"), (TILE_SIZE, TILE_SIZE))
         except Exception:
             # fallback caso não ache o arquivo
             self.base_image = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
@@ -86,6 +91,10 @@ class Player(pygame.sprite.Sprite):
         self.vulnerable = True
         self.hurt_time = 0
         self.hurt = False          # se está usando o frame de dano
+        self.blink = False         # meio-transparente neste tick (pisca invulnerável)
+        # Cópias translúcidas dos frames para o piscar: os do frame_cache são
+        # compartilhados e não podem ter o alpha alterado
+        self.blink_frames = {}
 
         # Inimigos e tiro
         self.enemy_sprites = enemy_sprites
@@ -96,6 +105,9 @@ class Player(pygame.sprite.Sprite):
         # Som
         self.sound_manager = sound_manager
 
+        # Entrada (teclado por padrão; roteiro no modo headless)
+        self.input_source = input_source if input_source is not None else KeyboardInput()
+
         # Sistema de level
         self.xp = 0
         self.level = 1
@@ -126,35 +138,11 @@ class Player(pygame.sprite.Sprite):
         4 5 6
         7 8 9
         """
-        base_dir = os.path.dirname(__file__)
-        img_path = os.path.join(base_dir, "assets", "Protagonista.png")
-        sheet = pygame.image.load(img_path).convert_alpha()
-
-
-        sheet_width, sheet_height = sheet.get_size()
-        frame_width = sheet_width // 3
-        frame_height = sheet_height // 3
-
-        def get_frame(col, row):
-            frame = pygame.Surface((frame_width, frame_height), pygame.SRCALPHA)
-            frame.blit(
-                sheet,
-                (0, 0),
-                pygame.Rect(col * frame_width, row * frame_height, frame_width, frame_height)
-            )
-            frame = pygame.transform.scale(frame, (TILE_SIZE*3, TILE_SIZE*3))
-            return frame
-
-        # Numeração 1–9
-        f1 = get_frame(0, 0)  # 1
-        f2 = get_frame(1, 0)  # 2
-        f3 = get_frame(2, 0)  # 3
-        f4 = get_frame(0, 1)  # 4
-        f5 = get_frame(1, 1)  # 5
-        f6 = get_frame(2, 1)  # 6
-        f7 = get_frame(0, 2)  # 7
-        f8 = get_frame(1, 2)  # 8
-        f9 = get_frame(2, 2)  # 9 (dano)
+        img_path = asset_path("Protagonista.png")
+        frame_size = (TILE_SIZE * 3, TILE_SIZE * 3)
+
+        # Os frames vêm do cache compartilhado (recorte + escala só na 1ª vez)
+        f1, f2, f3, f4, f5, f6, f7, f8, f9 = frame_cache.get_frames(img_path, (3, 3), frame_size)
 
         # Frame de dano
         self.hurt_frame = f9
@@ -165,10 +153,8 @@ class Player(pygame.sprite.Sprite):
         up_frames = [f3, f4]
         # Corrida pra esquerda (5–8)
         left_frames = [f5, f6, f7, f8]
-        # Direita = flip horizontal da esquerda
-        right_frames = [
-            pygame.transform.flip(frame, True, False) for frame in left_frames
-        ]
+        # Direita = flip horizontal da esquerda (também cacheado)
+        right_frames = list(frame_cache.get_frames(img_path, (3, 3), frame_size, flip=True)[4:8])
 
         self.animations = {
             "down": down_frames,
@@ -184,7 +170,7 @@ class Player(pygame.sprite.Sprite):
     # ---------------- ENTRADA / MOVIMENTO -----------------
 
     def input(self):
-        keys = pygame.key.get_pressed()
+        keys = self.input_source.get_pressed()
 
         self.direction.x = 0
         self.direction.y = 0
@@ -227,8 +213,8 @@ class Player(pygame.sprite.Sprite):
             self.direction = self.direction.normalize()
         self.rect.center += self.direction * speed
         
-        # Limita o movimento dentro do mapa (2000x2000)
-        map_size = 2000
+        # Limita o movimento dentro do mapa (MAP_SIZE x MAP_SIZE)
+        map_size = MAP_SIZE
         half_width = self.rect.width // 2
         half_height = self.rect.height // 2
         
@@ -251,23 +237,20 @@ class Player(pygame.sprite.Sprite):
             self.integrity -= amount
             self.vulnerable = False
             self.hurt = True
-            self.hurt_time = pygame.time.get_ticks()
+            self.hurt_time = self.clock.get_ticks()
             print(f"ALERTA DE SEGURANÇA: Integridade em {self.integrity}%")
 
     def cooldowns(self):
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
 
         if not self.vulnerable:
             if current_time - self.hurt_time >= PLAYER_INVINCIBILITY:
                 self.vulnerable = True
                 self.hurt = False
-                self.image.set_alpha(255)
+                self.blink = False
             else:
                 # Pisca enquanto invulnerável
-                if (current_time // 100) % 2 == 0:
-                    self.image.set_alpha(100)
-                else:
-                    self.image.set_alpha(255)
+                self.blink = (current_time // 100) % 2 == 0
 
     # ---------------- TIRO AUTOMÁTICO -----------------
 
@@ -275,13 +258,18 @@ class Player(pygame.sprite.Sprite):
         if not self.enemy_sprites:
             return None
 
+        # Com a grade espacial a busca é por anéis de células, sem varrer todos
+        if isinstance(self.enemy_sprites, SpatialGroup):
+            return self.enemy_sprites.nearest(self.rect.center)
+
         nearest_enemy = None
         min_distance = float('inf')
-        player_vec = pygame.math.Vector2(self.rect.center)
+        px, py = self.rect.center
 
+        # Distância ao quadrado: mesma ordem, sem raiz nem Vector2
         for enemy in self.enemy_sprites:
-            enemy_vec = pygame.math.Vector2(enemy.rect.center)
-            dist = player_vec.distance_to(enemy_vec)
+            ex, ey = enemy.rect.center
+            dist = (ex - px) * (ex - px) + (ey - py) * (ey - py)
             if dist < min_distance:
                 min_distance = dist
                 nearest_enemy = enemy
@@ -289,7 +277,7 @@ class Player(pygame.sprite.Sprite):
         return nearest_enemy
 
     def auto_shoot(self):
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
 
         if self.can_shoot:
             target = self.get_nearest_enemy()
@@ -307,9 +295,16 @@ class Player(pygame.sprite.Sprite):
 
                 self.create_projectile(self.rect.center, direction)
 
+    def hold_fire(self, duration):
+        """Segura o tiro por duration ms de jogo (sem encurtar um cooldown maior)"""
+        release = self.clock.get_ticks() + duration - self.projectile_cooldown
+        if self.can_shoot or release > self.shoot_time:
+            self.shoot_time = release
+        self.can_shoot = False
+
     def weapon_cooldowns(self):
         if not self.can_shoot:
-            current_time = pygame.time.get_ticks()
+            current_time = self.clock.get_ticks()
             if current_time - self.shoot_time >= self.projectile_cooldown:
                 self.can_shoot = True
 
@@ -318,15 +313,25 @@ class Player(pygame.sprite.Sprite):
     def animate(self):
         # Se estiver em estado de dano, usa frame 9
         if self.hurt:
-            self.image = self.hurt_frame
-            return
-
-        animation = self.animations[self.status]
-        self.frame_index += self.animation_speed
-        if self.frame_index >= len(animation):
-            self.frame_index = 0
-
-        self.image = animation[int(self.frame_index)]
+            image = self.hurt_frame
+        else:
+            animation = self.animations[self.status]
+            self.frame_index += self.animation_speed
+            if self.frame_index >= len(animation):
+                self.frame_index = 0
+            image = animation[int(self.frame_index)]
+
+        if self.blink:
+            image = self.get_blink_frame(image)
+        self.image = image
+
+    def get_blink_frame(self, image):
+        """Cópia translúcida (alpha 100) de um frame, feita uma vez por frame"""
+        blink_frame = self.blink_frames.get(image)
+        if blink_frame is None:
+            blink_frame = self.blink_frames[image] = image.copy()
+            blink_frame.set_alpha(100)
+        return blink_frame
 
     # ---------------- UPDATE GERAL -----------------
 
@@ -341,9 +346,22 @@ class Player(pygame.sprite.Sprite):
 
 
 class Malware(pygame.sprite.Sprite):
-    def __init__(self, pos, player, groups, health_mult=1.0, speed_mult=1.0, damage_mult=1.0):
+    # Estado que vai para os arrays do SwarmEngine quando ele está ativo
+    health = SwarmField()
+    animation_index = SwarmField()
+    state = SwarmField(codes=("walk", "hurt"))
+    hurt_time = SwarmField()
+
+    def __init__(self, pos, player, groups, health_mult=1.0, speed_mult=1.0, damage_mult=1.0, swarm=None, clock=None):
         super().__init__(groups)
-        
+
+        # Relógio do jogo (duração do estado de dano)
+        self.clock = clock if clock is not None else real_clock
+
+        # Motor vetorizado (opcional); sem ele o update() move o sprite
+        self.swarm = None
+        self.swarm_slot = None
+
         # Carregar spritesheet do inimigo
         self.load_images()
         self.image = self.walk_frames[0]
@@ -366,34 +384,20 @@ class Malware(pygame.sprite.Sprite):
         self.hurt_time = 0
         self.hurt_duration = 120     # ms que fica no frame de dano
 
+        if swarm is not None:
+            swarm.add(self)
+
     def load_images(self):
         # Spritesheet: 2 colunas x 2 linhas
-        # Pega a pasta onde o sprites.py está
-        base_dir = os.path.dirname(__file__)
-        # Monta o caminho completo até a imagem
-        img_path = os.path.join(base_dir, "assets", "Inimigo.png")
-        sheet = pygame.image.load(img_path).convert_alpha()
-        sheet_width, sheet_height = sheet.get_size()
-
-
-        frame_width = sheet_width // 2
-        frame_height = sheet_height // 2
-
-        def get_frame(col, row):
-            frame = pygame.Surface((frame_width, frame_height), pygame.SRCALPHA)
-            frame.blit(
-                sheet,
-                (0, 0),
-                pygame.Rect(col * frame_width, row * frame_height, frame_width, frame_height),
-            )
-            # Escala para o tamanho do inimigo definido em settings.py
-            frame = pygame.transform.scale(frame, (ENEMY_SIZE, ENEMY_SIZE))
-            return frame
+        # O cache compartilhado garante que o spawn não lê o disco nem reescala
+        # (só o primeiro inimigo paga o custo do carregamento)
+        img_path = asset_path("Inimigo.png")
+        frames = frame_cache.get_frames(img_path, (2, 2), (ENEMY_SIZE, ENEMY_SIZE))
 
         # 0,0 e 1,0 → caminhada
-        self.walk_frames = [get_frame(0, 0), get_frame(1, 0)]
+        self.walk_frames = [frames[0], frames[1]]
         # 0,1 → dano
-        self.hurt_frame = get_frame(0, 1)
+        self.hurt_frame = frames[2]
 
     def hunt_player(self):
         player_vector = pygame.math.Vector2(self.player.rect.center)
@@ -408,11 +412,17 @@ class Malware(pygame.sprite.Sprite):
     def take_damage(self, amount):
         self.health -= amount
         self.state = "hurt"
-        self.hurt_time = pygame.time.get_ticks()
+        self.hurt_time = self.clock.get_ticks()
 
         if self.health <= 0:
             self.kill()
 
+    def kill(self):
+        # Sai do enxame antes de sair dos grupos (o estado volta para o sprite)
+        if self.swarm_slot is not None:
+            self.swarm.remove(self)
+        super().kill()
+
     def animate(self):
         if self.state == "walk":
             self.animation_index += self.animation_speed
@@ -425,7 +435,7 @@ class Malware(pygame.sprite.Sprite):
     def update_state(self):
         # Sai do estado de dano depois de hurt_duration ms
         if self.state == "hurt":
-            current_time = pygame.time.get_ticks()
+            current_time = self.clock.get_ticks()
             if current_time - self.hurt_time >= self.hurt_duration:
                 self.state = "walk"
 
@@ -438,22 +448,51 @@ class Malware(pygame.sprite.Sprite):
 class Projectile(pygame.sprite.Sprite):
     # cache da imagem pra não recarregar do disco toda hora
     _base_image = None
+    # tabela de rotações pré-calculadas (uma por passo angular)
+    _rotated_images = None
 
     @classmethod
     def _get_base_image(cls):
         if cls._base_image is None:
-            base_dir = os.path.dirname(__file__)
-            img_path = os.path.join(base_dir, "assets", "Projetil.png")
+            img_path = asset_path("Projetil.png")
+            cls._base_image = frame_cache.get_image(img_path, (PROJECTILE_SIZE, PROJECTILE_SIZE))
+        return cls._base_image
 
-            image = pygame.image.load(img_path).convert_alpha()
-            image = pygame.transform.scale(image, (PROJECTILE_SIZE, PROJECTILE_SIZE))
+    @classmethod
+    def _get_rotated_images(cls):
+        """Monta (uma vez) a tabela com PROJECTILE_ROTATION_STEPS rotações da imagem base"""
+        if cls._rotated_images is None:
+            base_image = cls._get_base_image()
+            step = 360 / PROJECTILE_ROTATION_STEPS
+            # OBS: aqui estou assumindo que a sprite aponta "pra cima" originalmente.
+            # Se ela apontar para a direita, é só tirar o -90.
+            cls._rotated_images = [
+                pygame.transform.rotate(base_image, index * step - 90)
+                for index in range(PROJECTILE_ROTATION_STEPS)
+            ]
+        return cls._rotated_images
 
-            cls._base_image = image
-        return cls._base_image
+    @classmethod
+    def get_rotated_image(cls, direction):
+        """Retorna a entrada da tabela mais próxima do ângulo da direção"""
+        images = cls._get_rotated_images()
+        angle = math.degrees(math.atan2(-direction.y, direction.x))
+        index = round(angle * PROJECTILE_ROTATION_STEPS / 360) % PROJECTILE_ROTATION_STEPS
+        return images[index]
 
-    def __init__(self, pos, direction, groups, speed=PROJECTILE_SPEED, damage=PROJECTILE_DAMAGE):
+    # Área em que o tiro ainda pode acertar algo; fora dela ele é descartado
+    _map_rect = pygame.Rect(0, 0, MAP_SIZE, MAP_SIZE)
+
+    def __init__(self, pos, direction, groups, speed=PROJECTILE_SPEED, damage=PROJECTILE_DAMAGE, pool=None, clock=None):
         super().__init__(groups)
 
+        # Pool que recebe o tiro de volta quando ele sai de jogo
+        self.pool = pool
+        self.clock = clock if clock is not None else real_clock
+        self.spawn(pos, direction, speed, damage)
+
+    def spawn(self, pos, direction, speed=PROJECTILE_SPEED, damage=PROJECTILE_DAMAGE):
+        """(Re)inicializa o tiro. Usado tanto na criação quanto na reutilização pelo pool"""
         # direção
         self.direction = pygame.math.Vector2(direction)
         if self.direction.length_squared() != 0:
@@ -463,32 +502,80 @@ class Projectile(pygame.sprite.Sprite):
 
         self.speed = speed
         self.damage = damage
+        self.spawn_time = self.clock.get_ticks()
 
-        # imagem base
-        base_image = self._get_base_image()
-
-        # calcula o ângulo a partir da direção
-        # OBS: aqui estou assumindo que a sprite aponta "pra cima" originalmente.
-        # Se ela apontar para a direita, é só tirar o -90.
-        angle = math.degrees(math.atan2(-self.direction.y, self.direction.x)) - 90
-
-        # rotaciona mantendo o centro
-        self.image = pygame.transform.rotate(base_image, angle)
+        # imagem já rotacionada (compartilhada entre tiros com a mesma direção)
+        self.image = self.get_rotated_image(self.direction)
         self.rect = self.image.get_rect(center=pos)
 
     def update(self):
         # move o tiro
         self.rect.center += self.direction * self.speed
-        # depois podemos colocar limite de tela / lifetime se quiser
+
+        # Some quando o tempo de vida acaba ou quando sai do mapa
+        if self.clock.get_ticks() - self.spawn_time >= PROJECTILE_LIFETIME:
+            self.kill()
+        elif not self._map_rect.colliderect(self.rect):
+            self.kill()
+
+    def kill(self):
+        # Remove de todos os grupos e devolve ao pool (se ainda estava em jogo)
+        was_alive = self.alive()
+        super().kill()
+        if was_alive and self.pool is not None:
+            self.pool.release(self)
+
+
+class ProjectilePool:
+    """Recicla instâncias de Projectile para não alocar um sprite novo a cada tiro"""
+
+    def __init__(self, groups, max_size=PROJECTILE_POOL_SIZE, clock=None):
+        self.groups = groups
+        self.max_size = max_size
+        self.clock = clock
+        self._free = []
+
+        # Estatísticas
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, pos, direction, speed=PROJECTILE_SPEED, damage=PROJECTILE_DAMAGE):
+        """Devolve um tiro ativo, reaproveitando um livre quando houver"""
+        if self._free:
+            projectile = self._free.pop()
+            projectile.spawn(pos, direction, speed, damage)
+            projectile.add(self.groups)
+            self.reused += 1
+        else:
+            projectile = Projectile(pos, direction, self.groups, speed, damage, pool=self, clock=self.clock)
+            self.created += 1
+        return projectile
+
+    def release(self, projectile):
+        """Guarda um tiro que saiu de jogo (chamado por Projectile.kill)"""
+        if len(self._free) < self.max_size:
+            self._free.append(projectile)
+
+    def clear(self):
+        self._free.clear()
 
 
 class DataDrop(pygame.sprite.Sprite):
+    # Quadrado compartilhado por todos os drops (cada um não cria o seu)
+    _image = None
+
+    @classmethod
+    def get_image(cls):
+        if cls._image is None:
+            cls._image = pygame.Surface((XP_SIZE, XP_SIZE))
+            cls._image.fill(COLOR_XP)
+        return cls._image
+
     def __init__(self, pos, player, groups):
         super().__init__(groups)
         
         # Visual: Pequeno quadrado de dados
-        self.image = pygame.Surface((XP_SIZE, XP_SIZE))
-        self.image.fill(COLOR_XP)
+        self.image = self.get_image()
         self.rect = self.image.get_rect(center=pos)
         
         # Referências
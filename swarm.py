@@ -0,0 +1,201 @@
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional: sem ele cada Malware se move sozinho
+    np = None
+
+HAS_NUMPY = np is not None
+
+
+class SwarmField:
+    """
+    Atributo de Malware que passa a morar nos arrays do SwarmEngine quando o
+    sprite está registrado nele. Fora do enxame funciona como atributo normal,
+    então take_damage/animate continuam iguais nos dois caminhos.
+    """
+
+    def __init__(self, codes=None):
+        # codes: valores textuais guardados como índice (ex.: "walk"/"hurt")
+        self.codes = codes
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, sprite, owner=None):
+        if sprite is None:
+            return self
+        if sprite.swarm_slot is None:
+            return sprite.__dict__[self.name]
+        value = sprite.swarm.arrays[self.name][sprite.swarm_slot].item()
+        return self.codes[value] if self.codes else value
+
+    def __set__(self, sprite, value):
+        if sprite.__dict__.get('swarm_slot') is None:
+            sprite.__dict__[self.name] = value
+            return
+        if self.codes:
+            value = self.codes.index(value)
+        sprite.swarm.arrays[self.name][sprite.swarm_slot] = value
+
+
+class SwarmEngine:
+    """
+    Motor vetorizado (struct-of-arrays) para o movimento dos Malware.
+
+    Posições, velocidades, vida, estado de dano e índice de animação de todos
+    os inimigos ficam em arrays NumPy; update() avança o enxame inteiro com
+    poucas operações de array, reproduzindo exatamente Malware.update
+    (inclusive o arredondamento que o pygame faz ao gravar rect.center).
+
+    Os rects são sincronizados para todos os inimigos que mudaram de pixel,
+    porque colisão e mira dependem deles; as imagens (animação) só são
+    atualizadas para quem está dentro da área visível.
+    """
+
+    FIELDS = {
+        'x': 'float64',
+        'y': 'float64',
+        'speed': 'float64',
+        'health': 'int64',
+        'animation_index': 'float64',
+        'state': 'int8',
+        'hurt_time': 'int64',
+        'hurt_duration': 'int64',
+        'animation_speed': 'float64',
+        'frame_count': 'int64',
+    }
+
+    def __init__(self, capacity=256):
+        if not HAS_NUMPY:
+            raise RuntimeError("SwarmEngine precisa do NumPy instalado")
+
+        self.sprites = []
+        self.capacity = capacity
+        self.arrays = {name: np.zeros(capacity, dtype) for name, dtype in self.FIELDS.items()}
+
+    def __len__(self):
+        return len(self.sprites)
+
+    # ---------------- REGISTRO -----------------
+
+    def _grow(self):
+        self.capacity *= 2
+        for name, array in self.arrays.items():
+            grown = np.zeros(self.capacity, array.dtype)
+            grown[:len(array)] = array
+            self.arrays[name] = grown
+
+    def add(self, sprite):
+        """Move o estado do sprite para os arrays e devolve o slot ocupado"""
+        slot = len(self.sprites)
+        if slot >= self.capacity:
+            self._grow()
+
+        arrays = self.arrays
+        arrays['x'][slot], arrays['y'][slot] = sprite.rect.center
+        arrays['speed'][slot] = sprite.speed
+        arrays['animation_speed'][slot] = sprite.animation_speed
+        arrays['hurt_duration'][slot] = sprite.hurt_duration
+        arrays['frame_count'][slot] = len(sprite.walk_frames)
+
+        # Campos que o Malware lê/escreve via SwarmField
+        values = {name: getattr(sprite, name) for name in ('health', 'animation_index', 'state', 'hurt_time')}
+        self.sprites.append(sprite)
+        sprite.swarm = self
+        sprite.swarm_slot = slot
+        for name, value in values.items():
+            setattr(sprite, name, value)
+        return slot
+
+    def remove(self, sprite):
+        """Tira o sprite do enxame (troca com o último slot para não deixar buraco)"""
+        slot = sprite.swarm_slot
+        if slot is None or sprite.swarm is not self:
+            return
+
+        # Devolve o estado para o próprio sprite
+        values = {name: getattr(sprite, name) for name in ('health', 'animation_index', 'state', 'hurt_time')}
+        x, y = self.arrays['x'][slot].item(), self.arrays['y'][slot].item()
+        sprite.swarm_slot = None
+        for name, value in values.items():
+            setattr(sprite, name, value)
+        sprite.rect.center = (x, y)
+
+        last = len(self.sprites) - 1
+        if slot != last:
+            moved = self.sprites[last]
+            for array in self.arrays.values():
+                array[slot] = array[last]
+            self.sprites[slot] = moved
+            moved.swarm_slot = slot
+        self.sprites.pop()
+
+    def clear(self):
+        """Descarta todos os inimigos (usado ao reiniciar o jogo)"""
+        for sprite in self.sprites:
+            sprite.swarm_slot = None
+        self.sprites.clear()
+
+    # ---------------- SIMULAÇÃO -----------------
+
+    @staticmethod
+    def _round_half_away(values):
+        # Mesmo arredondamento do pygame ao gravar floats em rect.center
+        floor = np.floor(values)
+        frac = values - floor
+        return floor + ((frac > 0.5) | ((frac == 0.5) & (values > 0)))
+
+    def update(self, target_pos, current_time, view_rect=None):
+        """Avança todos os inimigos um passo em direção a target_pos"""
+        count = len(self.sprites)
+        if not count:
+            return
+
+        arrays = self.arrays
+        x = arrays['x'][:count]
+        y = arrays['y'][:count]
+
+        # hunt_player: direção normalizada até o player
+        dx = target_pos[0] - x
+        dy = target_pos[1] - y
+        length = np.sqrt(dx * dx + dy * dy)
+        moving = length > 0
+        safe_length = np.where(moving, length, 1.0)
+        dir_x = np.where(moving, dx / safe_length, 0.0)
+        dir_y = np.where(moving, dy / safe_length, 0.0)
+
+        # rect.center += direction * speed (com o arredondamento do Rect)
+        speed = arrays['speed'][:count]
+        new_x = self._round_half_away(x + dir_x * speed)
+        new_y = self._round_half_away(y + dir_y * speed)
+        changed = np.flatnonzero((new_x != x) | (new_y != y))
+        x[:] = new_x
+        y[:] = new_y
+
+        # update_state: sai do estado de dano depois de hurt_duration
+        state = arrays['state'][:count]
+        hurt = state == 1
+        recovered = hurt & (current_time - arrays['hurt_time'][:count] >= arrays['hurt_duration'][:count])
+        state[recovered] = 0
+
+        # animate: só quem está andando avança o índice da animação
+        walking = state == 0
+        animation = arrays['animation_index'][:count]
+        animation[walking] += arrays['animation_speed'][:count][walking]
+        animation[walking & (animation >= arrays['frame_count'][:count])] = 0
+
+        # Sincroniza os rects de quem mudou de pixel
+        sprites = self.sprites
+        for slot, cx, cy in zip(changed.tolist(), new_x[changed].tolist(), new_y[changed].tolist()):
+            sprites[slot].rect.center = (cx, cy)
+
+        # Troca a imagem só de quem vai ser desenhado
+        if view_rect is None:
+            visible = np.arange(count)
+        else:
+            visible = np.flatnonzero(
+                (x >= view_rect.left) & (x < view_rect.right) &
+                (y >= view_rect.top) & (y < view_rect.bottom)
+            )
+        for slot, frame, is_hurt in zip(visible.tolist(), animation[visible].astype(int).tolist(), (state[visible] == 1).tolist()):
+            sprite = sprites[slot]
+            sprite.image = sprite.hurt_frame if is_hurt else sprite.walk_frames[frame]
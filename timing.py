@@ -0,0 +1,35 @@
+import pygame
+from settings import TICK_RATE
+
+# Relógios da lógica do jogo (cooldowns, hordas, spawn...).
+# Quem mede tempo de jogo recebe um relógio no construtor e só chama
+# get_ticks(); assim a simulação não depende de quanto tempo real passou.
+
+
+class RealClock:
+    """Relógio de parede do pygame (padrão de quem é criado sem relógio)"""
+
+    def get_ticks(self):
+        return pygame.time.get_ticks()
+
+
+real_clock = RealClock()
+
+
+class SimulationClock:
+    """
+    Relógio da simulação: só anda quando advance() é chamado, sempre um passo
+    fixo de 1/tick_rate segundo. O tempo em ms é calculado a partir do número
+    de ticks (sem acumular float), então é o mesmo em qualquer máquina.
+    """
+
+    def __init__(self, tick_rate=TICK_RATE):
+        self.tick_rate = tick_rate
+        self.step_ms = 1000 / tick_rate
+        self.ticks = 0
+
+    def get_ticks(self):
+        return self.ticks * 1000 // self.tick_rate
+
+    def advance(self):
+        self.ticks += 1
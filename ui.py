@@ -1,21 +1,31 @@
 import pygame
 import random
 import os
+from collections import OrderedDict
 from settings import *
+from fonts import get_font, render_text
 
 class UpgradeConsole:
-    def __init__(self, player, dialogue_system, sound_manager=None):
+    def __init__(self, player, dialogue_system, sound_manager=None, rng=None):
         self.player = player
         self.dialogue_system = dialogue_system
         self.sound_manager = sound_manager
 
+        # Sorteio das opções (RNG com semente do Game para ser reproduzível)
+        self.rng = rng if rng is not None else random.Random()
+
         self.display_surface = pygame.display.get_surface()
         
-        self.font = pygame.font.SysFont("consolas", 20) 
-        self.header_font = pygame.font.SysFont("consolas", 30, bold=True)
+        self.font = get_font("consolas", 20) 
+        self.header_font = get_font("consolas", 30, bold=True)
 
         self.options = [] 
         self.rects = []
+
+        # Janela e cartões pré-renderizados (montados em generate_options)
+        self.panel = None
+        self.panel_pos = (0, 0)
+        self.cards = []
         
         # Flag para evitar múltiplos cliques
         self.can_click = True
@@ -79,9 +89,12 @@ class UpgradeConsole:
         ]
 
         
-        self.options = random.sample(pool, 3)
+        self.options = self.rng.sample(pool, 3)
         self.rects = [] 
 
+        # As opções só mudam aqui: monta os cartões uma vez por level up
+        self.build_cards()
+
     def apply_upgrade(self, upgrade):
         """Aplica a lógica matemática no Player"""
         print(f"Executando script: {upgrade['name']}...")
@@ -100,91 +113,132 @@ class UpgradeConsole:
         log_entry = f"> {upgrade['name']} ({upgrade['desc']})"
         self.player.upgrades_history.append(log_entry)
 
-    def display(self):
-        # 1. Configuração da Janela
+    def get_layout(self):
+        """Posição e tamanho da janela do console (centralizada na tela)"""
         width = 700
         height = 500
         x = (WIDTH - width) // 2
         y = (HEIGHT - height) // 2
-        
+        return x, y, width, height
+
+    def preview_stat(self, option):
+        """Texto do UPDATE LOG: valor atual -> valor depois do upgrade"""
+        current_val = 0
+        new_val = 0
+        unit = ""
+        
+        # Lógica de previsão baseada no tipo (Mesma lógica do apply_upgrade)
+        if option['type'] == 'speed':
+            current_val = self.player.speed
+            new_val = current_val * option['value']
+            unit = "px/frame"
+        elif option['type'] == 'cooldown':
+            current_val = self.player.projectile_cooldown
+            new_val = current_val * option['value']
+            unit = "ms (delay)"
+        elif option['type'] == 'health':
+            current_val = self.player.max_integrity
+            new_val = current_val + option['value']
+            unit = "HP"
+        elif option['type'] == 'damage':
+            current_val = self.player.projectile_damage
+            new_val = current_val + option['value']
+            unit = "dmg"
+
+        return f"    [ UPDATE LOG: {current_val:.1f} -> {new_val:.1f} {unit} ]"
+
+    def build_cards(self):
+        """
+        Pré-renderiza a janela e os cartões das opções atuais.
+
+        self.panel já traz fundo, borda, cabeçalho e as opções no estado normal;
+        self.cards guarda, por opção, o retângulo clicável e a versão "hover"
+        do cartão, que display() só cola por cima quando o mouse passa.
+        """
+        x, y, width, height = self.get_layout()
         bg_rect = pygame.Rect(x, y, width, height)
-        pygame.draw.rect(self.display_surface, (0, 0, 0), bg_rect)
-        pygame.draw.rect(self.display_surface, (0, 255, 0), bg_rect, 3)
-        
+
+        # 1. Janela vazia (coordenadas locais)
+        base = pygame.Surface(bg_rect.size).convert()
+        local_bg = base.get_rect()
+        pygame.draw.rect(base, (0, 0, 0), local_bg)
+        pygame.draw.rect(base, (0, 255, 0), local_bg, 3)
+
         # 2. Cabeçalho
         header_text = f"root@server:~/updates# install_patch --level={self.player.level}"
-        header_surf = self.font.render(header_text, True, (0, 255, 0))
-        self.display_surface.blit(header_surf, (x + 20, y + 20))
+        header_surf = render_text(self.font, header_text, (0, 255, 0))
+        base.blit(header_surf, (20, 20))
 
-        # 3. Loop das Opções
-        mouse_pos = pygame.mouse.get_pos()
+        self.panel = base.copy()
+        self.panel_pos = bg_rect.topleft
+        self.cards = []
         self.rects = []
-        hover_text = "Escolha um patch para melhorar a defesa do servidor."
-        hover_title = "TUX AI [UPGRADE LOG]:"
-
-        if not self.options:
-            self.generate_options()
 
+        # 3. Cartões das opções
         for index, option in enumerate(self.options):
             item_y = y + 100 + (index * 110)
             
             item_rect = pygame.Rect(x + 20, item_y, width - 40, 90)
             self.rects.append(item_rect)
             
-            # Hover Effect
-            color_text = (0, 255, 0)     # Verde Hacker
             color_desc = (0, 180, 0)     # Verde Escuro
             color_stats = (0, 255, 255)  # Ciano (para os números destacarem)
-            
 
+            name_text = f"[{index+1}] {option['name']}"
+            desc_surf = render_text(self.font, f"    >> {option['desc']}", color_desc)
+            stat_surf = render_text(self.font, self.preview_stat(option), color_stats)
+            cursor = render_text(self.font, ">", (0, 255, 0))
+
+            def draw_card(target, origin, color_text, hovered):
+                ox, oy = origin
+                if hovered:
+                    pygame.draw.rect(target, (0, 50, 0), item_rect.move(-ox, -oy))
+                    target.blit(cursor, (x + 5 - ox, item_y + 10 - oy))
+                name_surf = render_text(self.header_font, name_text, color_text)
+                target.blit(name_surf, (x + 30 - ox, item_y + 5 - oy))
+                target.blit(desc_surf, (x + 30 - ox, item_y + 35 - oy))
+                target.blit(stat_surf, (x + 30 - ox, item_y + 60 - oy))
+
+            # Estado normal vai direto para o painel
+            draw_card(self.panel, bg_rect.topleft, (0, 255, 0), False)  # Verde Hacker
+
+            # Área que o estado hover pode tocar (retângulo, cursor e textos)
+            hover_name = render_text(self.header_font, name_text, (200, 255, 200))
+            card_rect = item_rect.unionall([
+                cursor.get_rect(topleft=(x + 5, item_y + 10)),
+                hover_name.get_rect(topleft=(x + 30, item_y + 5)),
+                desc_surf.get_rect(topleft=(x + 30, item_y + 35)),
+                stat_surf.get_rect(topleft=(x + 30, item_y + 60)),
+            ]).clip(bg_rect)
+
+            # Hover: parte da janela vazia + destaque desenhado por cima
+            hover = base.subsurface(card_rect.move(-x, -y)).copy()
+            draw_card(hover, card_rect.topleft, (200, 255, 200), True)
+
+            self.cards.append({'rect': item_rect, 'hover': hover, 'hover_pos': card_rect.topleft})
 
-            if item_rect.collidepoint(mouse_pos):
-                pygame.draw.rect(self.display_surface, (0, 50, 0), item_rect)
-                color_text = (200, 255, 200)
-                cursor = self.font.render(">", True, (0, 255, 0))
-                self.display_surface.blit(cursor, (x + 5, item_y + 10))
-                hover_text = option.get('edu_text', "Analisando...")
+    def display(self):
+        if not self.options:
+            self.generate_options()
 
-            # Nome e Descrição
-            name_surf = self.header_font.render(f"[{index+1}] {option['name']}", True, color_text)
-            self.display_surface.blit(name_surf, (x + 30, item_y + 5))
-            
-            desc_surf = self.font.render(f"    >> {option['desc']}", True, color_desc)
-            self.display_surface.blit(desc_surf, (x + 30, item_y + 35))
+        # 1. Janela, cabeçalho e cartões já renderizados
+        self.display_surface.blit(self.panel, self.panel_pos)
 
-            # --- 4. CALCULAR E DESENHAR PREVIEW DOS STATS ---
-            current_val = 0
-            new_val = 0
-            unit = ""
-            
-            # Lógica de previsão baseada no tipo (Mesma lógica do apply_upgrade)
-            if option['type'] == 'speed':
-                current_val = self.player.speed
-                new_val = current_val * option['value']
-                unit = "px/frame"
-            elif option['type'] == 'cooldown':
-                current_val = self.player.projectile_cooldown
-                new_val = current_val * option['value']
-                unit = "ms (delay)"
-            elif option['type'] == 'health':
-                current_val = self.player.max_integrity
-                new_val = current_val + option['value']
-                unit = "HP"
-            elif option['type'] == 'damage':
-                current_val = self.player.projectile_damage
-                new_val = current_val + option['value']
-                unit = "dmg"
-
-            stat_text = f"    [ UPDATE LOG: {current_val:.1f} -> {new_val:.1f} {unit} ]"
-            
-            stat_surf = self.font.render(stat_text, True, color_stats)
-            self.display_surface.blit(stat_surf, (x + 30, item_y + 60))
+        # 2. Cartão sob o mouse troca para a versão destacada
+        mouse_pos = pygame.mouse.get_pos()
+        hover_text = "Escolha um patch para melhorar a defesa do servidor."
+        hover_title = "TUX AI [UPGRADE LOG]:"
+
+        for option, card in zip(self.options, self.cards):
+            if card['rect'].collidepoint(mouse_pos):
+                self.display_surface.blit(card['hover'], card['hover_pos'])
+                hover_text = option.get('edu_text', "Analisando...")
         
-        # 5. Desenhar Caixa de Diálogo Educativa
+        # 3. Desenhar Caixa de Diálogo Educativa
         self.dialogue_system.execute(hover_text, hover_title)
 
-    def update(self):
-        """Retorna True se escolheu algo (para fechar o menu)"""
+    def get_clicked_option(self):
+        """Índice do card clicado neste frame (ou None)"""
         current_time = pygame.time.get_ticks()
         
         # Detecta clique apenas quando o botão é PRESSIONADO (não segurado)
@@ -193,50 +247,49 @@ class UpgradeConsole:
         # Se o mouse não está pressionado, libera para próximo clique
         if not mouse_pressed:
             self.can_click = True
-            return False
+            return None
         
         # Se está pressionado mas já clicou recentemente, ignora
         if not self.can_click:
-            return False
+            return None
         
         # Se chegou aqui, é um clique válido
-        if mouse_pressed and self.can_click:
-            mouse_pos = pygame.mouse.get_pos()
-            
-            for index, rect in enumerate(self.rects):
-                if rect.collidepoint(mouse_pos):
-                    # Marca que já clicou (não pode clicar de novo até soltar)
-                    self.can_click = False
-                    self.last_click_time = current_time
-                    
-                    # Aplicar upgrade e sinalizar para fechar menu
-                    self.apply_upgrade(self.options[index])
-                    
-                    # Restaura toda a vida do player ao subir de nível
-                    self.player.integrity = self.player.max_integrity
-
-                    # Pequeno delay para não atirar assim que sair do menu
-                    pygame.time.wait(200) 
-                    return True
-        
-        return False
+        mouse_pos = pygame.mouse.get_pos()
+        
+        for index, rect in enumerate(self.rects):
+            if rect.collidepoint(mouse_pos):
+                # Marca que já clicou (não pode clicar de novo até soltar)
+                self.can_click = False
+                self.last_click_time = current_time
+                return index
+        
+        return None
+
+    def select(self, index):
+        """Aplica o upgrade escolhido (fecha o menu)"""
+        self.apply_upgrade(self.options[index])
+        
+        # Restaura toda a vida do player ao subir de nível
+        self.player.integrity = self.player.max_integrity
     
 class DialogueSystem:
     def __init__(self, player):
         self.player = player
         self.display_surface = pygame.display.get_surface()
-        self.font = pygame.font.SysFont("consolas", 18)
-        self.title_font = pygame.font.SysFont("consolas", 18, bold=True)
+        self.font = get_font("consolas", 18)
+        self.title_font = get_font("consolas", 18, bold=True)
         
         self.active = False
         self.current_text = ""
         self.current_title = "TUX AI [LOG DE SEGURANÇA]:"
 
+        # Caixas já compostas (LRU) e avatar escalado
+        self._panels = OrderedDict()
+        self._avatar = None
 
-    def draw_text_wrapped(self, text, rect, color):
-        """Quebra o texto automaticamente para caber na caixa"""
-        y = rect.top
-        line_height = self.font.get_height() * 1.2
+    def wrap_text(self, text, width):
+        """Quebra o texto em linhas que cabem em width"""
+        lines = []
         words = text.split(' ')
         current_line_words = []
 
@@ -244,87 +297,202 @@ class DialogueSystem:
             test_line = ' '.join(current_line_words + [word])
             w, h = self.font.size(test_line)
             
-            if w > rect.width:
-                line_surf = self.font.render(' '.join(current_line_words), True, color)
-                self.display_surface.blit(line_surf, (rect.left, y))
-                y += line_height
+            if w > width:
+                lines.append(' '.join(current_line_words))
                 current_line_words = [word]
             else:
                 current_line_words.append(word)
         
         if current_line_words:
-            line_surf = self.font.render(' '.join(current_line_words), True, color)
-            self.display_surface.blit(line_surf, (rect.left, y))
+            lines.append(' '.join(current_line_words))
+        return lines
 
-    def execute(self, text, title="TUX AI [SYSTEM LOG]:"):
-        """Método principal para chamar no loop do jogo"""
-        screen_w, screen_h = self.display_surface.get_size()
-        
-        # Config Layout
-        box_height = 140
-        margin = 20
+    def layout_text(self, text, rect, color):
+        """Linhas renderizadas do texto quebrado, como pares (superfície, posição)"""
+        y = rect.top
+        line_height = self.font.get_height() * 1.2
+        placed = []
+        for line in self.wrap_text(text, rect.width):
+            placed.append((render_text(self.font, line, color), (rect.left, y)))
+            y += line_height
+        return placed
+
+    def draw_text_wrapped(self, text, rect, color):
+        """Quebra o texto automaticamente para caber na caixa"""
+        for line_surf, pos in self.layout_text(text, rect, color):
+            self.display_surface.blit(line_surf, pos)
+
+    def get_avatar(self, avatar_size):
+        """Avatar do Tux escalado para a caixa (escala só quando o tamanho muda)"""
+        width, height = self.player.image.get_size()
+        scale = avatar_size / width
+        size = (int(width * scale), int(height * scale))
+        if self._avatar is None or self._avatar.get_size() != size:
+            self._avatar = pygame.transform.scale(self.player.base_image, size)
+        return self._avatar
+
+    def build_panel(self, text, title, box_rect):
+        """
+        Compõe a caixa inteira (fundo, avatar, título e texto) numa superfície.
+
+        Linhas que não cabem dentro da caixa ficam de fora do painel e são
+        devolvidas à parte, para continuar sendo desenhadas direto na tela.
+        """
+        panel = pygame.Surface(box_rect.size).convert()
+        local_rect = panel.get_rect()
         padding = 15
         
-        box_rect = pygame.Rect(margin, screen_h - box_height - margin, screen_w - (margin * 2), box_height)
-        
         # 1. Desenhar Fundo e Borda
-        pygame.draw.rect(self.display_surface, (10, 15, 30), box_rect) # Fundo Azul Escuro
-        pygame.draw.rect(self.display_surface, (0, 200, 200), box_rect, 2) # Borda Neon
+        pygame.draw.rect(panel, (10, 15, 30), local_rect) # Fundo Azul Escuro
+        pygame.draw.rect(panel, (0, 200, 200), local_rect, 2) # Borda Neon
         
         # 2. Desenhar Avatar (Player)
         avatar_size = 100
-        avatar_rect = pygame.Rect(box_rect.left + padding, box_rect.top + padding, avatar_size, avatar_size)
+        avatar_rect = pygame.Rect(padding, padding, avatar_size, avatar_size)
         
-        pygame.draw.rect(self.display_surface, (0, 0, 0), avatar_rect)
-        pygame.draw.rect(self.display_surface, (0, 200, 200), avatar_rect, 1)
+        pygame.draw.rect(panel, (0, 0, 0), avatar_rect)
+        pygame.draw.rect(panel, (0, 200, 200), avatar_rect, 1)
         
         if hasattr(self.player, 'image'):
-             scale = avatar_size / self.player.image.get_width()
-             image = pygame.transform.scale(self.player.base_image, (int(self.player.image.get_width() * scale), int(self.player.image.get_height() * scale)))
+             image = self.get_avatar(avatar_size)
              img_rect = image.get_rect(center=avatar_rect.center)
-             self.display_surface.blit(image, img_rect)
+             panel.blit(image, img_rect)
         else:
-             pygame.draw.rect(self.display_surface, COLOR_PLAYER, avatar_rect.inflate(-20, -20))
+             pygame.draw.rect(panel, COLOR_PLAYER, avatar_rect.inflate(-20, -20))
 
         # 3. Desenhar Texto
         text_x = avatar_rect.right + padding
-        text_y = box_rect.top + padding
-        text_w = box_rect.width - avatar_size - (padding * 3)
+        text_y = padding
+        text_w = local_rect.width - avatar_size - (padding * 3)
         
         # Título
-        title_surf = self.title_font.render(title, True, (0, 255, 255))
-        self.display_surface.blit(title_surf, (text_x, text_y))
+        title_surf = render_text(self.title_font, title, (0, 255, 255))
+        panel.blit(title_surf, (text_x, text_y))
+        
+        # Corpo do Texto (posições calculadas em coordenadas de tela, como antes,
+        # para o arredondamento das linhas sair idêntico)
+        body_rect = pygame.Rect(box_rect.left + text_x, box_rect.top + text_y + 30, text_w, local_rect.height - 30)
+        overflow = []
+        for line_surf, (x, y) in self.layout_text(text, body_rect, (220, 220, 220)):
+            screen_pos = (x, int(y))
+            if box_rect.contains(line_surf.get_rect(topleft=screen_pos)):
+                panel.blit(line_surf, (x - box_rect.left, screen_pos[1] - box_rect.top))
+            else:
+                overflow.append((line_surf, screen_pos))
+
+        return panel, overflow
+
+    def execute(self, text, title="TUX AI [SYSTEM LOG]:"):
+        """Método principal para chamar no loop do jogo"""
+        screen_w, screen_h = self.display_surface.get_size()
+        
+        # Config Layout
+        box_height = 140
+        margin = 20
         
-        # Corpo do Texto
-        body_rect = pygame.Rect(text_x, text_y + 30, text_w, box_rect.height - 30)
-        self.draw_text_wrapped(text, body_rect, (220, 220, 220))
+        box_rect = pygame.Rect(margin, screen_h - box_height - margin, screen_w - (margin * 2), box_height)
+
+        # O painel só é recomposto quando texto, título ou tamanho mudam
+        avatar_key = self.player.image.get_size() if hasattr(self.player, 'image') else None
+        key = (text, title, box_rect.size, avatar_key)
+        cached = self._panels.get(key)
+        if cached is None:
+            cached = self.build_panel(text, title, box_rect)
+            self._panels[key] = cached
+            if len(self._panels) > DIALOGUE_CACHE_SIZE:
+                self._panels.popitem(last=False)
+        else:
+            self._panels.move_to_end(key)
+
+        panel, overflow = cached
+        self.display_surface.blit(panel, box_rect.topleft)
+        for line_surf, pos in overflow:
+            self.display_surface.blit(line_surf, pos)
 
 # ui.py (Adicione ao final)
 
-class GameOverScreen:
+class OverlayScreen:
+    """
+    Base das telas cheias (game over, vitória, pausa e início).
+
+    O fundo semi-transparente é criado uma vez e os textos estáticos viram uma
+    sequência de blits pronta; por frame sobra um blit do fundo, a borda, um
+    Surface.blits com os textos e o que pisca. A sequência é recomposta quando
+    layer_key() muda.
+    """
+    overlay_color = (0, 0, 0)
+    overlay_alpha = 230
+    border_color = (255, 255, 255)
+    border_width = 4
+    border_rect = pygame.Rect(50, 50, WIDTH - 100, HEIGHT - 100)
+
     def __init__(self):
         self.display_surface = pygame.display.get_surface()
-        self.title_font = pygame.font.SysFont("consolas", 60, bold=True)
-        self.text_font = pygame.font.SysFont("consolas", 24)
-        self.sub_font = pygame.font.SysFont("consolas", 18)
+        self._overlay = None
+        self._layer = None
+        self._layer_key = None
+
+    def layer_key(self):
+        """Valor que, quando muda, obriga a recompor a parte estática"""
+        return None
+
+    def compose(self, layer):
+        """Acrescenta em layer os pares (superfície, posição) estáticos da tela"""
+
+    def draw_dynamic(self):
+        """Desenha a parte que muda a cada frame (ex.: prompt piscando)"""
+
+    def invalidate(self):
+        """Descarta o que está pronto (será recomposto no próximo display)"""
+        self._overlay = None
+        self._layer = None
 
     def display(self):
-        # 1. Fundo Semi-transparente Vermelho (Sangue Digital)
-        overlay = pygame.Surface((WIDTH, HEIGHT))
-        overlay.fill((20, 0, 0)) # Fundo quase preto, levemente vermelho
-        overlay.set_alpha(230)   # Transparência
-        self.display_surface.blit(overlay, (0, 0))
+        if self._overlay is None:
+            self._overlay = pygame.Surface((WIDTH, HEIGHT))
+            self._overlay.fill(self.overlay_color)
+            self._overlay.set_alpha(self.overlay_alpha)
+
+        key = self.layer_key()
+        if self._layer is None or key != self._layer_key:
+            self._layer = []
+            self.compose(self._layer)
+            self._layer_key = key
+
+        self.display_surface.blit(self._overlay, (0, 0))
+        pygame.draw.rect(self.display_surface, self.border_color, self.border_rect, self.border_width)
+        self.display_surface.blits(self._layer, doreturn=False)
+        self.draw_dynamic()
+
+
+class GameOverScreen(OverlayScreen):
+    # 1. Fundo Semi-transparente Vermelho (Sangue Digital)
+    overlay_color = (20, 0, 0) # Fundo quase preto, levemente vermelho
+    overlay_alpha = 230        # Transparência
 
-        # 2. Borda de Erro Crítico
-        pygame.draw.rect(self.display_surface, (255, 0, 0), (50, 50, WIDTH-100, HEIGHT-100), 4)
+    # 2. Borda de Erro Crítico
+    border_color = (255, 0, 0)
+
+    def __init__(self):
+        super().__init__()
+        self.title_font = get_font("consolas", 60, bold=True)
+        self.text_font = get_font("consolas", 24)
+        self.sub_font = get_font("consolas", 18)
+
+        # Botão de "Tentar Novamente" (posição calculada uma vez)
+        prompt_text = "Pressione [ESPAÇO] para Reinicializar o Sistema"
+        self.prompt_surf = render_text(self.text_font, prompt_text, (255, 0, 0))
+        self.prompt_rect = self.prompt_surf.get_rect(center=(WIDTH // 2, HEIGHT - 150))
+
+    def compose(self, items):
         
         # 3. Textos
         center_x = WIDTH // 2
         
         # Título: SYSTEM FAILURE
-        title_surf = self.title_font.render("SYSTEM FAILURE", True, (255, 0, 0))
+        title_surf = render_text(self.title_font, "SYSTEM FAILURE", (255, 0, 0))
         title_rect = title_surf.get_rect(center=(center_x, 150))
-        self.display_surface.blit(title_surf, title_rect)
+        items.append((title_surf, title_rect))
         
         # Mensagem Principal
         msg_lines = [
@@ -337,41 +505,43 @@ class GameOverScreen:
         
         for i, line in enumerate(msg_lines):
             color = (255, 255, 255) if i != 4 else (255, 50, 50) # A linha "Demits" em vermelho
-            text_surf = self.text_font.render(line, True, color)
+            text_surf = render_text(self.text_font, line, color)
             text_rect = text_surf.get_rect(center=(center_x, 280 + (i * 40)))
-            self.display_surface.blit(text_surf, text_rect)
+            items.append((text_surf, text_rect))
 
+    def draw_dynamic(self):
         # 4. Botão de "Tentar Novamente" (Piscando)
         current_time = pygame.time.get_ticks()
         if (current_time // 500) % 2 == 0: # Pisca a cada meio segundo
-            prompt_text = "Pressione [ESPAÇO] para Reinicializar o Sistema"
-            prompt_surf = self.text_font.render(prompt_text, True, (255, 0, 0))
-            prompt_rect = prompt_surf.get_rect(center=(center_x, HEIGHT - 150))
-            self.display_surface.blit(prompt_surf, prompt_rect)
+            self.display_surface.blit(self.prompt_surf, self.prompt_rect)
+
+class VictoryScreen(OverlayScreen):
+    # 1. Fundo Semi-transparente Verde (Sucesso Matrix)
+    overlay_color = (0, 20, 10) # Fundo verde muito escuro
+    overlay_alpha = 230
+
+    # 2. Borda de Sucesso
+    border_color = (0, 255, 0)
 
-class VictoryScreen:
     def __init__(self):
-        self.display_surface = pygame.display.get_surface()
-        self.title_font = pygame.font.SysFont("consolas", 60, bold=True)
-        self.text_font = pygame.font.SysFont("consolas", 24)
-        
-    def display(self):
-        # 1. Fundo Semi-transparente Verde (Sucesso Matrix)
-        overlay = pygame.Surface((WIDTH, HEIGHT))
-        overlay.fill((0, 20, 10)) # Fundo verde muito escuro
-        overlay.set_alpha(230)
-        self.display_surface.blit(overlay, (0, 0))
+        super().__init__()
+        self.title_font = get_font("consolas", 60, bold=True)
+        self.text_font = get_font("consolas", 24)
 
-        # 2. Borda de Sucesso
-        pygame.draw.rect(self.display_surface, (0, 255, 0), (50, 50, WIDTH-100, HEIGHT-100), 4)
+        # Botão de Reinício
+        prompt_text = "Pressione [ESPAÇO] para Iniciar Novo Turno"
+        self.prompt_surf = render_text(self.text_font, prompt_text, (255, 255, 255))
+        self.prompt_rect = self.prompt_surf.get_rect(center=(WIDTH // 2, HEIGHT - 150))
+        
+    def compose(self, items):
         
         # 3. Textos
         center_x = WIDTH // 2
         
         # Título
-        title_surf = self.title_font.render("SYSTEM SECURED", True, (0, 255, 0))
+        title_surf = render_text(self.title_font, "SYSTEM SECURED", (0, 255, 0))
         title_rect = title_surf.get_rect(center=(center_x, 150))
-        self.display_surface.blit(title_surf, title_rect)
+        items.append((title_surf, title_rect))
         
         # Mensagem Principal
         msg_lines = [
@@ -386,74 +556,85 @@ class VictoryScreen:
         for i, line in enumerate(msg_lines):
             # A última linha (Promoção) em Ciano para destaque
             color = (150, 255, 150) if i != 5 else (0, 255, 255) 
-            text_surf = self.text_font.render(line, True, color)
+            text_surf = render_text(self.text_font, line, color)
             text_rect = text_surf.get_rect(center=(center_x, 280 + (i * 40)))
-            self.display_surface.blit(text_surf, text_rect)
+            items.append((text_surf, text_rect))
 
+    def draw_dynamic(self):
         # 4. Botão de Reinício
         current_time = pygame.time.get_ticks()
         if (current_time // 500) % 2 == 0: 
-            prompt_text = "Pressione [ESPAÇO] para Iniciar Novo Turno"
-            prompt_surf = self.text_font.render(prompt_text, True, (255, 255, 255))
-            prompt_rect = prompt_surf.get_rect(center=(center_x, HEIGHT - 150))
-            self.display_surface.blit(prompt_surf, prompt_rect)
+            self.display_surface.blit(self.prompt_surf, self.prompt_rect)
+
+class PauseScreen(OverlayScreen):
+    # 1. Overlay Escuro
+    overlay_color = (0, 0, 20)
+    overlay_alpha = 240
+
+    # 2. Borda
+    border_color = (0, 100, 255) # Azul Sistema
+    border_width = 3
 
-class PauseScreen:
     def __init__(self, player):
+        super().__init__()
         self.player = player
-        self.display_surface = pygame.display.get_surface()
-        self.title_font = pygame.font.SysFont("consolas", 50, bold=True)
-        self.list_font = pygame.font.SysFont("consolas", 20)
-        self.info_font = pygame.font.SysFont("arial", 16)
+        self.title_font = get_font("consolas", 50, bold=True)
+        self.list_font = get_font("consolas", 20)
+        self.info_font = get_font("arial", 16)
 
-    def display(self):
-        # 1. Overlay Escuro
-        overlay = pygame.Surface((WIDTH, HEIGHT))
-        overlay.fill((0, 0, 20)) 
-        overlay.set_alpha(240)
-        self.display_surface.blit(overlay, (0, 0))
+        # 4. Rodapé
+        footer_text = "Pressione [ESC] para retomar a execução do kernel..."
+        self.footer_surf = render_text(self.info_font, footer_text, (255, 255, 255))
+        self.footer_rect = self.footer_surf.get_rect(center=(WIDTH//2, HEIGHT - 80))
 
-        # 2. Borda e Título
-        border_rect = pygame.Rect(50, 50, WIDTH-100, HEIGHT-100)
-        pygame.draw.rect(self.display_surface, (0, 100, 255), border_rect, 3) # Azul Sistema
-        
-        title_surf = self.title_font.render("SISTEMA SUSPENSO", True, (0, 200, 255))
+    def layer_key(self):
+        # O histórico só cresce: o tamanho basta para saber se mudou
+        return len(self.player.upgrades_history)
+
+    def compose(self, items):
+        # 2. Título
+        title_surf = render_text(self.title_font, "SISTEMA SUSPENSO", (0, 200, 255))
         title_rect = title_surf.get_rect(center=(WIDTH//2, 100))
-        self.display_surface.blit(title_surf, title_rect)
+        items.append((title_surf, title_rect))
 
         # 3. Lista de Upgrades (Histórico)
         list_start_y = 180
         list_x = 100
         
-        header = self.list_font.render("PATCHES INSTALADOS E MÓDULOS ATIVOS:", True, (255, 255, 255))
-        self.display_surface.blit(header, (list_x, list_start_y))
+        header = render_text(self.list_font, "PATCHES INSTALADOS E MÓDULOS ATIVOS:", (255, 255, 255))
+        items.append((header, (list_x, list_start_y)))
         
         # Desenha a lista (limitada aos ultimos 15 para não vazar a tela)
         history = self.player.upgrades_history[-15:] 
         
         if not history:
-            no_upgrades = self.list_font.render("> Nenhum patch instalado. Sistema vulnerável.", True, (150, 150, 150))
-            self.display_surface.blit(no_upgrades, (list_x + 20, list_start_y + 40))
+            no_upgrades = render_text(self.list_font, "> Nenhum patch instalado. Sistema vulnerável.", (150, 150, 150))
+            items.append((no_upgrades, (list_x + 20, list_start_y + 40)))
         else:
             for i, item in enumerate(history):
-                text_surf = self.list_font.render(item, True, (0, 255, 0)) # Verde terminal
-                self.display_surface.blit(text_surf, (list_x + 20, list_start_y + 40 + (i * 25)))
+                text_surf = render_text(self.list_font, item, (0, 255, 0)) # Verde terminal
+                items.append((text_surf, (list_x + 20, list_start_y + 40 + (i * 25))))
 
+    def draw_dynamic(self):
         # 4. Rodapé
-        footer_text = "Pressione [ESC] para retomar a execução do kernel..."
         current_time = pygame.time.get_ticks()
         if (current_time // 800) % 2 == 0:
-            footer_surf = self.info_font.render(footer_text, True, (255, 255, 255))
-            footer_rect = footer_surf.get_rect(center=(WIDTH//2, HEIGHT - 80))
-            self.display_surface.blit(footer_surf, footer_rect)
+            self.display_surface.blit(self.footer_surf, self.footer_rect)
+
+
+class StartScreen(OverlayScreen):
+    # 1. Fundo escuro com tom azulado
+    overlay_color = (0, 0, 20)  # azul bem escuro
+    overlay_alpha = 230
 
+    # Borda em azul claro
+    border_color = (0, 180, 255)
 
-class StartScreen:
     def __init__(self):
-        self.display_surface = pygame.display.get_surface()
-        self.title_font = pygame.font.SysFont("consolas", 60, bold=True)
-        self.text_font = pygame.font.SysFont("consolas", 24)
-        self.sub_font = pygame.font.SysFont("consolas", 18)
+        super().__init__()
+        self.title_font = get_font("consolas", 60, bold=True)
+        self.text_font = get_font("consolas", 24)
+        self.sub_font = get_font("consolas", 18)
 
         base_dir = os.path.dirname(__file__)  # pasta onde está o ui.py
         icon_path = os.path.join(base_dir, "assets", "security_icon.png")
@@ -466,23 +647,24 @@ class StartScreen:
             self.icon_image = pygame.Surface((58, 58), pygame.SRCALPHA)
             self.icon_image.fill((0, 200, 255))  # bloquinho azul-ciano
 
+        # Prompt piscando para iniciar
+        prompt_text = "Pressione [ESPAÇO] para Inicializar o Sistema"
+        self.prompt_surf = render_text(self.text_font, prompt_text, (220, 220, 220))
+        self.prompt_rect = self.prompt_surf.get_rect(center=(WIDTH // 2, HEIGHT - 140))
 
-    def display(self):
-        # 1. Fundo escuro com tom azulado
-        overlay = pygame.Surface((WIDTH, HEIGHT))
-        overlay.fill((0, 0, 20))  # azul bem escuro
-        overlay.set_alpha(230)
-        self.display_surface.blit(overlay, (0, 0))
+        # Progresso do carregamento dos assets (0 a 1); None = pronto, mostra o prompt
+        self.progress = None
+        self.progress_rect = pygame.Rect(0, 0, 400, 16)
+        self.progress_rect.center = self.prompt_rect.center
 
-        # Borda em azul claro
-        pygame.draw.rect(self.display_surface, (0, 180, 255),(50, 50, WIDTH - 100, HEIGHT - 100),4)
 
+    def compose(self, items):
         center_x = WIDTH // 2
 
         # Título principal
-        title_surf = self.title_font.render("SYSTEM ONLINE", True, (0, 200, 255))
+        title_surf = render_text(self.title_font, "SYSTEM ONLINE", (0, 200, 255))
         title_rect = title_surf.get_rect(center=(center_x, 150))
-        self.display_surface.blit(title_surf, title_rect)
+        items.append((title_surf, title_rect))
 
         # Mensagem principal (texto que você pediu)
         msg_lines = [
@@ -491,25 +673,34 @@ class StartScreen:
         ]
 
         for i, line in enumerate(msg_lines):
-            text_surf = self.text_font.render(line, True, (220, 220, 220))
+            text_surf = render_text(self.text_font, line, (220, 220, 220))
             text_rect = text_surf.get_rect(center=(center_x, 260 + i * 35))
-            self.display_surface.blit(text_surf, text_rect)
+            items.append((text_surf, text_rect))
 
         # Subtexto
         sub_line = "< Proteja os dados da empresa a todo custo >"
-        sub_surf = self.sub_font.render(sub_line, True, (0, 200, 255))
+        sub_surf = render_text(self.sub_font, sub_line, (0, 200, 255))
         sub_rect = sub_surf.get_rect(center=(center_x, 340))
-        self.display_surface.blit(sub_surf, sub_rect)
+        items.append((sub_surf, sub_rect))
 
         #Icone de defesa
         icon_y = (sub_rect.bottom + (HEIGHT - 160)) // 2  # meio do caminho
         icon_rect = self.icon_image.get_rect(center=(center_x, icon_y))
-        self.display_surface.blit(self.icon_image, icon_rect)
+        items.append((self.icon_image, icon_rect))
+
+    def draw_dynamic(self):
+        if self.progress is not None:
+            # Barra de carregamento no lugar do prompt
+            bar = self.progress_rect
+            pygame.draw.rect(self.display_surface, (0, 200, 255), bar, 1)
+            fill = bar.inflate(-4, -4)
+            fill.width = int(fill.width * self.progress)
+            self.display_surface.fill((0, 200, 255), fill)
+            label = render_text(self.sub_font, f"Carregando módulos... {self.progress:.0%}", (220, 220, 220))
+            self.display_surface.blit(label, label.get_rect(midbottom=(bar.centerx, bar.top - 8)))
+            return
 
         # Prompt piscando para iniciar
         current_time = pygame.time.get_ticks()
         if (current_time // 500) % 2 == 0:
-            prompt_text = "Pressione [ESPAÇO] para Inicializar o Sistema"
-            prompt_surf = self.text_font.render(prompt_text, True, (220, 220, 220))
-            prompt_rect = prompt_surf.get_rect(center=(center_x, HEIGHT - 140))
-            self.display_surface.blit(prompt_surf, prompt_rect)
+            self.display_surface.blit(self.prompt_surf, self.prompt_rect)